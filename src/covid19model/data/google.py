@@ -60,6 +60,16 @@ def get_google_mobility_data(update=True, plot=False, filename_plot=None):
     abs_dir = os.path.dirname(__file__)
     dtypes = {'sub_region_1': str, 'sub_region_2': str}
 
+    # Assign data to output variables
+    variable_mapping = {
+        'retail_and_recreation_percent_change_from_baseline': 'retail_recreation',
+        'grocery_and_pharmacy_percent_change_from_baseline': 'grocery',
+        'parks_percent_change_from_baseline': 'parks',
+        'transit_stations_percent_change_from_baseline': 'transport',
+        'workplaces_percent_change_from_baseline': 'work',
+        'residential_percent_change_from_baseline': 'residential'
+    }
+
     if update:
         # download raw data
         df = pd.read_csv(url, parse_dates=['date'], dtype=dtypes)
@@ -67,23 +77,16 @@ def get_google_mobility_data(update=True, plot=False, filename_plot=None):
         rel_dir = os.path.join(abs_dir, '../../../data/raw/google/community_mobility_data.csv')
         df.to_csv(rel_dir, index=False)
     else:
+        # only read the columns that are used, dates are parsed after selecting the Belgian data
+        usecols = ['country_region', 'sub_region_1', 'date'] + list(variable_mapping.keys())
         df = pd.read_csv(os.path.join(abs_dir,
             '../../../data/raw/google/community_mobility_data.csv'),
-            parse_dates=['date'], dtype=dtypes)
+            usecols=usecols, dtype=dtypes)
 
     # Extract only Belgian data
-    df=df[df['country_region']=='Belgium']
-    data=df[df['sub_region_1'].isnull().values]
+    data = df[(df['country_region']=='Belgium') & df['sub_region_1'].isnull()]
+    data = data.assign(date=pd.to_datetime(data['date']))
 
-    # Assign data to output variables
-    variable_mapping = {
-        'retail_and_recreation_percent_change_from_baseline': 'retail_recreation',
-        'grocery_and_pharmacy_percent_change_from_baseline': 'grocery',
-        'parks_percent_change_from_baseline': 'parks',
-        'transit_stations_percent_change_from_baseline': 'transport',
-        'workplaces_percent_change_from_baseline': 'work',
-        'residential_percent_change_from_baseline': 'residential'
-    }
     data = data.rename(columns=variable_mapping)
     data = data.set_index("date")
     data.index.freq = 'D'
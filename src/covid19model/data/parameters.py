@@ -90,7 +90,7 @@ def get_COVID19_SEIRD_parameters(stratified=True):
 
         # verity_etal
         df = pd.read_csv(os.path.join(par_raw_path,"verity_etal.csv"), sep=',',header='infer')
-        pars_dict['h'] =  np.array(df.loc[:,'symptomatic_hospitalized'].astype(float).tolist())/100
+        pars_dict['h'] =  df.loc[:,'symptomatic_hospitalized'].to_numpy(dtype=float)/100
 
         # molenberghs_etal
         #df = pd.read_csv(os.path.join(par_raw_path,"molenberghs_etal.csv"), sep=',',header='infer')
@@ -98,8 +98,8 @@ def get_COVID19_SEIRD_parameters(stratified=True):
 
         # davies_etal
         df_asymp = pd.read_csv(os.path.join(par_raw_path,"davies_etal.csv"), sep=',',header='infer')
-        pars_dict['a'] =  np.array(df_asymp.loc[:,'fraction asymptomatic'].astype(float).tolist())
-        pars_dict['s'] =  np.array(df_asymp.loc[:,'relative susceptibility'].astype(float).tolist())
+        pars_dict['a'] =  df_asymp.loc[:,'fraction asymptomatic'].to_numpy(dtype=float)
+        pars_dict['s'] =  df_asymp.loc[:,'relative susceptibility'].to_numpy(dtype=float)
 
     else:
         pars_dict['Nc'] = np.array([11.2])
@@ -1,5 +1,6 @@
 import os
 import datetime
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 
@@ -31,12 +32,20 @@ def get_interaction_matrices():
     ----------
     The interaction matrices are extracted from the polymod dataset `contacts.Rdata`: https://lwillem.shinyapps.io/socrates_rshiny/.
     The demographic data was retreived from https://statbel.fgov.be/en/themes/population/structure-population
+    The raw files are only read once per Python session, every call returns fresh copies of the cached arrays.
+    Use `get_interaction_matrices.cache_clear()` to force a new read from disk.
 
     Example use
     -----------
     initN, Nc_home, Nc_work, Nc_schools, Nc_transport, Nc_leisure, Nc_others, Nc_total = get_interaction_matrices()
     """
 
+    return tuple(matrix.copy() for matrix in _read_interaction_matrices())
+
+@lru_cache(maxsize=None)
+def _read_interaction_matrices():
+    """support function to read the interaction matrices from disk, cached by get_interaction_matrices"""
+
     abs_dir = os.path.dirname(__file__)
     polymod_path = os.path.join(abs_dir, "../../../data/raw/polymod/")
 
@@ -51,3 +60,5 @@ def get_interaction_matrices():
     initN = np.loadtxt(os.path.join(polymod_path, "demographic/BELagedist_10year.txt"), dtype='f', delimiter='\t')
 
     return initN, Nc_home, Nc_work, Nc_schools, Nc_transport, Nc_leisure, Nc_others, Nc_total
+
+get_interaction_matrices.cache_clear = _read_interaction_matrices.cache_clear
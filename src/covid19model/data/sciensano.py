@@ -82,10 +82,11 @@ def get_sciensano_COVID19_data(update=True):
     df["D_tot"] = df_mort.resample('D', on='DATE')['DEATHS'].sum()
 
     # Extract total reported deaths per day and per age group
-    df["D_25_44"] = df_mort.loc[(df_mort['AGEGROUP'] == '25-44')].resample('D', on='DATE')['DEATHS'].sum()
-    df["D_45_64"] = df_mort.loc[(df_mort['AGEGROUP'] == '45-64')].resample('D', on='DATE')['DEATHS'].sum()
-    df["D_65_74"] = df_mort.loc[(df_mort['AGEGROUP'] == '65-74')].resample('D', on='DATE')['DEATHS'].sum()
-    df["D_75_84"] = df_mort.loc[(df_mort['AGEGROUP'] == '75-84')].resample('D', on='DATE')['DEATHS'].sum()
-    df["D_85+"] = df_mort.loc[(df_mort['AGEGROUP'] == '85+')].resample('D', on='DATE')['DEATHS'].sum()
+    # (group the mortality data once, instead of filtering and resampling it per age group)
+    age_groups = ['25-44', '45-64', '65-74', '75-84', '85+']
+    df_mort_age = df_mort.groupby([pd.Grouper(key='DATE', freq='D'), 'AGEGROUP'])['DEATHS'].sum()
+    df_mort_age = df_mort_age.unstack(fill_value=0).reindex(columns=age_groups, fill_value=0)
+    for age_group in age_groups:
+        df["D_" + age_group.replace('-', '_')] = df_mort_age[age_group]
 
     return df.fillna(0)
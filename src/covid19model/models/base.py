@@ -1,12 +1,18 @@
 import inspect
-import itertools
+from functools import lru_cache
 
 import numpy as np
-from scipy.integrate import solve_ivp
+from scipy.integrate import solve_ivp, odeint
 import xarray
 import pandas as pd
 
 
+@lru_cache(maxsize=None)
+def _argument_names(function):
+    """Names of the arguments of a (model or compliance) function, inspected once per function"""
+    return list(inspect.signature(function).parameters.keys())
+
+
 class BaseModel:
     """
     Initialise the models
@@ -29,6 +35,7 @@ class BaseModel:
     parameters_stratified_names = None
     stratification = None
     apply_compliance_to = None
+    jacobian = None
 
     def __init__(self, states, parameters,compliance=None,discrete=False):
         self.parameters = parameters
@@ -61,8 +68,7 @@ class BaseModel:
 
     def _validate_compliance(self):
         # Validate arguments of compliance definition
-        sig = inspect.signature(self.compliance)
-        keywords = list(sig.parameters.keys())
+        keywords = _argument_names(self.compliance)
         if keywords[0] != "t":
             raise ValueError(
                 "The first parameter of the compliance function should be 't'"
@@ -101,8 +107,7 @@ class BaseModel:
 
         """
         # Validate Model class definition (the integrate function)
-        sig = inspect.signature(self.integrate)
-        keywords = list(sig.parameters.keys())
+        keywords = _argument_names(self.integrate)
         if keywords[0] != "t":
             raise ValueError(
                 "The first parameter of the 'integrate' function should be 't'"
@@ -139,15 +144,16 @@ class BaseModel:
                 raise ValueError(
                     "The parameter you want me to apply compliance to is not a model parameter "
                 )
-            self.compliance_position = [index for index in range(len(specified_params)) if specified_params[index] == self.apply_compliance_to][0]
+            self.compliance_position = specified_params.index(self.apply_compliance_to)
 
         # Validate the params
-        if set(self.parameters.keys()) != set(specified_params):
+        parameter_keys = set(self.parameters.keys())
+        if parameter_keys != set(specified_params):
             raise ValueError(
                 "The specified parameters don't exactly match the predefined parameters. "
                 "Redundant parameters: {0}. Missing parameters: {1}".format(
-                set(self.parameters.keys()).difference(set(specified_params)),
-                set(specified_params).difference(set(self.parameters.keys())))
+                parameter_keys.difference(specified_params),
+                set(specified_params).difference(parameter_keys))
             )
 
         self.parameters = {param: self.parameters[param] for param in specified_params}
@@ -208,62 +214,121 @@ class BaseModel:
         """to overwrite in subclasses"""
         raise NotImplementedError
 
+    def _split_parameters(self):
+        """
+        Split the parameters in the model parameters, ordered as in `integrate`,
+        and the arguments of the compliance function (None if no compliance applies)
+        """
+        compliance_pars = [v for k,v in self.parameters.items() if k in self.parameters_compliance_names]
+        model_pars = [v for k,v in self.parameters.items() if k not in self.parameters_compliance_names]
+
+        if self.compliance and self.time_of_lst_chk > 0:
+            compliance_args = (self.old, self.new, *compliance_pars)
+        else:
+            compliance_args = None
+        return model_pars, compliance_args
+
     def _create_fun(self):
         """Convert integrate statement to scipy-compatible function"""
 
-        def func(t, y, pars={}):
-            """As used by scipy -> flattend in, flattend out"""
-
-            compliance_pars = [v for k,v in pars.items() if k in self.parameters_compliance_names]
-            model_pars = [v for k,v in pars.items() if k not in self.parameters_compliance_names]
+        # prepare the parameters once per integration, not on every call of func
+        model_pars, compliance_args = self._split_parameters()
+        compliance = self.compliance
+        position = getattr(self, 'compliance_position', None)
+        time_of_lst_chk = self.time_of_lst_chk
+        integrate = self.integrate
+        shape = (len(self.state_names), self.stratification_size)
+
+        # choose the closure up front, without compliance the parameters are constant
+        if compliance_args is None:
+            def func(t, y):
+                """As used by scipy -> flattend in, flattend out"""
+
+                # for the moment assume sequence of parameters, vars,... is correct
+                y_reshaped = y.reshape(shape)
+                dstates = integrate(t, *y_reshaped, *model_pars)
+                return np.array(dstates).ravel()
+        else:
+            def func(t, y):
+                """As used by scipy -> flattend in, flattend out"""
 
-            if self.compliance and self.time_of_lst_chk > 0:
-                model_pars[self.compliance_position] = self.compliance(t-self.time_of_lst_chk, self.old, self.new, *compliance_pars)
+                pars = model_pars.copy()
+                pars[position] = compliance(t-time_of_lst_chk, *compliance_args)
 
-            # for the moment assume sequence of parameters, vars,... is correct
-            y_reshaped = y.reshape((len(self.state_names), self.stratification_size))
-            dstates = self.integrate(t, *y_reshaped, *model_pars)
-            return np.array(dstates).flatten()
+                # for the moment assume sequence of parameters, vars,... is correct
+                y_reshaped = y.reshape(shape)
+                dstates = integrate(t, *y_reshaped, *pars)
+                return np.array(dstates).ravel()
 
         return func
 
-    def _sim_single(self, time):
+    def _create_jac(self):
+        """Convert jacobian statement to scipy-compatible function"""
+
+        model_pars, compliance_args = self._split_parameters()
+        compliance = self.compliance
+        position = getattr(self, 'compliance_position', None)
+        time_of_lst_chk = self.time_of_lst_chk
+        jacobian = self.jacobian
+        shape = (len(self.state_names), self.stratification_size)
+
+        def jac(t, y):
+            """As used by scipy -> flattend in, (len(y), len(y)) matrix out"""
+
+            pars = model_pars
+            if compliance_args is not None:
+                pars = model_pars.copy()
+                pars[position] = compliance(t-time_of_lst_chk, *compliance_args)
+
+            y_reshaped = y.reshape(shape)
+            return jacobian(t, *y_reshaped, *pars)
+
+        return jac
+
+    def _sim_single(self, time, method='RK45'):
         """"""
         fun = self._create_fun()
 
         t0, t1 = time
         t_eval = np.arange(start=t0, stop=t1 + 1, step=1)
-
-        if self.discrete == False:
-            output = solve_ivp(fun, time,
-                           list(itertools.chain(*self.initial_states.values())),
-                           args=[self.parameters], t_eval=t_eval)
+        # initial states as one (N_states, stratification_size) array, flattened in state order
+        y0 = np.array(list(self.initial_states.values()), dtype=float).ravel()
+
+        if self.discrete == False and method == 'odeint':
+            # LSODA through odeint, which loops over the output times in Fortran
+            jac = self._create_jac() if self.jacobian is not None else None
+            y = odeint(fun, y0, t_eval, Dfun=jac, tfirst=True)
+            output = {
+                'y':    y.T,
+                't':    t_eval
+            }
+        elif self.discrete == False:
+            options = {}
+            # only the implicit solvers make use of the jacobian
+            if self.jacobian is not None and method in ['Radau', 'BDF', 'LSODA']:
+                options['jac'] = self._create_jac()
+            output = solve_ivp(fun, time, y0,
+                           t_eval=t_eval, method=method, **options)
         else:
-            output = self.solve_discrete(fun,time,list(itertools.chain(*self.initial_states.values())),
-                            args=self.parameters)
+            output = self.solve_discrete(fun,time,y0)
 
         # map to variable names
         return self._output_to_xarray_dataset(output)
 
-    def solve_discrete(self,fun,time,y,args):
+    def solve_discrete(self,fun,time,y):
         # Preparations
         y=np.asarray(y) # otherwise error in func : y.reshape does not work
-        y=np.reshape(y,[y.size,1])
-        y_prev=y
+        n_steps = int(np.ceil(time[1]-time[0]))
+        # Preallocate the output, one column per timestep
+        y_out = np.empty([y.size,n_steps+1])
+        y_out[:,0] = y
         # Iteration loop
-        t_lst=[time[0]]
-        t = time[0]
-        while t < time[1]:
-            out = fun(t,y_prev,args)
-            y_prev=out
-            out = np.reshape(out,[out.size,1])
-            y = np.append(y,out,axis=1)
-            t = t + 1
-            t_lst.append(t)
+        for k in range(n_steps):
+            y_out[:,k+1] = fun(time[0]+k,y_out[:,k])
         # Make a dictionary with output
         output = {
-            'y':    y,
-            't':    t_lst
+            'y':    y_out,
+            't':    time[0] + np.arange(n_steps+1)
         }
         return output
 
@@ -272,9 +337,9 @@ class BaseModel:
         Convert date string to int (i.e. number of days since day 0 of simulation,
         which is excess_time days before start_date)
         """
-        return int((pd.to_datetime(date)-pd.to_datetime(start_date))/pd.to_timedelta('1D'))+excess_time
+        return (pd.to_datetime(date)-pd.to_datetime(start_date)).days+excess_time
 
-    def sim(self, time, excess_time=None, checkpoints=None, start_date='2020-03-15'):
+    def sim(self, time, excess_time=None, checkpoints=None, start_date='2020-03-15', method='RK45'):
         """
         Run a model simulation for the given time period.
 
@@ -288,6 +353,15 @@ class BaseModel:
             in the form of
             ``{"time": [t1, t2, ..], "param": [param1, param2, ..], ..}``
             indicating new parameter values at the corresponding timestamps.
+        method : str
+            Integration method passed on to scipy.integrate.solve_ivp (ignored for discrete models).
+            The default 'RK45' is suited for these non-stiff models, the lower order 'RK23'
+            needs fewer function evaluations per step when a coarser accuracy suffices.
+            For the implicit methods ('Radau', 'BDF', 'LSODA'), the analytic jacobian of the
+            model is used when the model class defines a static method ``jacobian``, with the
+            same arguments as ``integrate``, returning the derivatives of the flattened states.
+            Use 'odeint' to integrate with scipy.integrate.odeint (LSODA) instead, which has a
+            lower overhead per timestep than solve_ivp for these small systems.
 
         Returns
         -------
@@ -298,6 +372,9 @@ class BaseModel:
         if isinstance(time, int):
             time = [0, time]
 
+        # parse the start date once, not for every date that is converted below
+        start_date = pd.to_datetime(start_date)
+
         if isinstance(time, str):
             time = [0, self.date_to_diff(start_date, time, excess_time)]
 
@@ -311,7 +388,7 @@ class BaseModel:
 
         if checkpoints is None:
             return self._sim_single(
-                time
+                time, method
                 )
 
         # checkpoints dictionary has the form of
@@ -322,7 +399,7 @@ class BaseModel:
 
         # first part of the simulation with original parameters
         output = self._sim_single(
-            [time_points[0], time_points[1]]
+            [time_points[0], time_points[1]], method
         )
         results.append(output)
         try:
@@ -350,7 +427,7 @@ class BaseModel:
                 self.time_of_lst_chk = time_points[i + 1]
 
                 output = self._sim_single(
-                    [time_points[i + 1], time_points[i + 2] ]
+                    [time_points[i + 1], time_points[i + 2] ], method
                 )
 
                 results.append(output.loc[dict(time=slice(time_points[i + 1]+1,time_points[i + 2]))])
@@ -381,10 +458,9 @@ class BaseModel:
         y_reshaped = output["y"].reshape(
             len(self.state_names), self.stratification_size, len(output["t"])
         )
-        data = {}
-        for var, arr in zip(self.state_names, y_reshaped):
-            xarr = xarray.DataArray(arr, coords=coords, dims=dims)
-            data[var] = xarr
+        # one DataArray with a 'state' dimension, split into the variables of the Dataset
+        coords["state"] = self.state_names
+        xarr = xarray.DataArray(y_reshaped, coords=coords, dims=['state'] + dims)
 
         attrs = {'parameters': dict(self.parameters)}
-        return xarray.Dataset(data, attrs=attrs)
+        return xarr.to_dataset(dim='state').assign_attrs(attrs)
@@ -55,11 +55,8 @@ def ramp_1(t,old,new,l):
     """
 
     # perform interpolation
-    if t <= l:
-        f = (1/l)*t
-    else:
-        f = 1.0
-    
+    f = min(t/l, 1.0)
+
     return old + f*(new-old)
 
 def ramp_2(t,old,new,l,tau):
@@ -89,11 +86,6 @@ def ramp_2(t,old,new,l,tau):
     """
 
     # perform interpolation
-    if t <= tau:
-        f = 0.0
-    elif tau < t <= tau+l:
-        f = (1/l)*t - (1/l)*tau
-    else:
-        f = 1.0
-   
+    f = min(max((t-tau)/l, 0.0), 1.0)
+
     return old + f*(new-old)
\ No newline at end of file
@@ -10,7 +10,6 @@ import numpy as np
 import scipy as scipy
 import scipy.integrate
 import pandas as pd
-import random
 from random import choices
 import matplotlib
 import matplotlib.pyplot as plt
@@ -133,42 +132,159 @@ class COVID19_SEIRD(BaseModel):
         N = S + E + I + A + M + ER + Ctot + ICU + R + SQ + EQ + IQ + AQ + MQ + RQ
         # calculate the test rates for each pool using the total number of available tests
         nT = S + E + I + A + M + R
-        theta_S = totalTests/nT
-        theta_S[theta_S > 1] = 1
-        theta_E = totalTests/nT
-        theta_E[theta_E > 1] = 1
-        theta_I = totalTests/nT
-        theta_I[theta_I > 1] = 1
-        theta_A = totalTests/nT
-        theta_A[theta_A > 1] = 1
-        theta_M = totalTests/nT
-        theta_M[theta_M > 1] = 1
-        theta_R = totalTests/nT
-        theta_R[theta_R > 1] = 1
+        # the test rate is the same for every pool (an empty age bin has nothing to test)
+        theta = np.minimum(np.divide(totalTests, nT, out=np.ones_like(nT), where=nT>0), 1)
+        # new infections, shared by dS and dE
+        # (an empty age bin has no infectious fraction, instead of a nan that spreads through Nc)
+        infectious = np.divide(I+A, N, out=np.zeros_like(N), where=N>0)
+        infection = beta*s*np.matmul(Nc,infectious*S)
+        # rates and flows that appear in more than one equation
+        inv_sigma = 1/sigma
+        inv_omega = 1/omega
+        a_omega = a/omega
+        m_omega = (1-a)/omega
+        h_R = (1-h)/dm
+        h_hospital = h/dhospital
+        hospitalised = (M+MQ)*h_hospital
+        ER_out = (1/der)*ER
+        C_R = (1-m0_C)*C*(1/dc_R)
+        C_D = m0_C*C*(1/dc_D)
+        ICU_R = (1-m0_ICU)*ICU/dICU_R
+        ICU_D = (m0_ICU/dICU_D)*ICU
+        C_icurec_R = C_icurec*(1/dICUrec)
         # calculate rates of change using the 2D arrays
-        dS  = - beta*s*np.matmul(Nc,((I+A)/N)*S) - theta_S*psi_FP*S + SQ/dq + zeta*R
-        dE  = beta*s*np.matmul(Nc,((I+A)/N)*S) - E/sigma - theta_E*psi_PP*E
-        dI = (1/sigma)*E - (1/omega)*I - theta_I*psi_PP*I
-        dA = (a/omega)*I - A/da - theta_A*psi_PP*A
-        dM = ((1-a)/omega)*I - M*((1-h)/dm) - M*h/dhospital - theta_M*psi_PP*M
-        dER = (M+MQ)*(h/dhospital) - (1/der)*ER
-        dC = c*(1/der)*ER - (1-m0_C)*C*(1/dc_R) - m0_C*C*(1/dc_D)
-        dC_icurec = ((1-m0_ICU)/dICU_R)*ICU - C_icurec*(1/dICUrec)
-        dICUstar = (1-c)*(1/der)*ER - (1-m0_ICU)*ICU/dICU_R - m0_ICU*ICU/dICU_D
-        dR  = A/da + ((1-h)/dm)*M + (1-m0_C)*C*(1/dc_R) + C_icurec*(1/dICUrec) + AQ/dq + MQ*((1-h)/dm) + RQ/dq - zeta*R
-        dD  = (m0_ICU/dICU_D)*ICU + (m0_C/dc_D)*C
-        dSQ = theta_S*psi_FP*S - SQ/dq
-        dEQ = theta_E*psi_PP*E - EQ/sigma
-        dIQ = theta_I*psi_PP*I + (1/sigma)*EQ - (1/omega)*IQ
-        dAQ = theta_A*psi_PP*A + (a/omega)*IQ - AQ/dq
-        dMQ = theta_M*psi_PP*M + ((1-a)/omega)*IQ - ((1-h)/dm)*MQ - (h/dhospital)*MQ
-        dRQ = theta_R*psi_FP*R - RQ/dq
-        dH_in = (M+MQ)*(h/dhospital) - H_in
-        dH_out =  (1-m0_C)*C*(1/dc_R) +  m0_C*C*(1/dc_D) + (m0_ICU/dICU_D)*ICU + C_icurec*(1/dICUrec) - H_out
-        dH_tot = (M+MQ)*(h/dhospital) - (1-m0_C)*C*(1/dc_R) -  m0_C*C*(1/dc_D) - (m0_ICU/dICU_D)*ICU - C_icurec*(1/dICUrec)
+        dS  = - infection - theta*psi_FP*S + SQ/dq + zeta*R
+        dE  = infection - E/sigma - theta*psi_PP*E
+        dI = inv_sigma*E - inv_omega*I - theta*psi_PP*I
+        dA = a_omega*I - A/da - theta*psi_PP*A
+        dM = m_omega*I - M*h_R - M*h_hospital - theta*psi_PP*M
+        dER = hospitalised - ER_out
+        dC = c*ER_out - C_R - C_D
+        dC_icurec = ICU_R - C_icurec_R
+        dICUstar = (1-c)*ER_out - ICU_R - ICU_D
+        dR  = A/da + h_R*M + C_R + C_icurec_R + AQ/dq + MQ*h_R + RQ/dq - zeta*R
+        dD  = ICU_D + C_D
+        dSQ = theta*psi_FP*S - SQ/dq
+        dEQ = theta*psi_PP*E - EQ/sigma
+        dIQ = theta*psi_PP*I + inv_sigma*EQ - inv_omega*IQ
+        dAQ = theta*psi_PP*A + a_omega*IQ - AQ/dq
+        dMQ = theta*psi_PP*M + m_omega*IQ - h_R*MQ - h_hospital*MQ
+        dRQ = theta*psi_FP*R - RQ/dq
+        dH_in = hospitalised - H_in
+        dH_out =  C_R + C_D + ICU_D + C_icurec_R - H_out
+        dH_tot = hospitalised - C_R - C_D - ICU_D - C_icurec_R
         return (dS, dE, dI, dA, dM, dER, dC, dC_icurec,
                 dICUstar, dR, dD, dSQ, dEQ, dIQ, dAQ, dMQ, dRQ,dH_in,dH_out,dH_tot)
 
+    @staticmethod
+    def jacobian(t, S, E, I, A, M, ER, C, C_icurec, ICU, R, D, SQ, EQ, IQ, AQ, MQ, RQ,H_in,H_out,H_tot,
+                  beta, sigma, omega, zeta, da, dm, der, dc_R, dc_D, dICU_R, dICU_D, dICUrec,
+                  dhospital, totalTests, psi_FP, psi_PP, dq, s, a, h, c, m0_C,m0_ICU, Nc):
+        """
+        Analytic jacobian of the deterministic implementation, used by the implicit solvers
+
+        Returns the derivatives of the flattened rates of change (state by state, age by age)
+        to the flattened states.
+        """
+
+        # positions of the states
+        (iS, iE, iI, iA, iM, iER, iC, iC_icurec, iICU, iR, iD, iSQ, iEQ, iIQ, iAQ, iMQ, iRQ,
+            iH_in, iH_out, iH_tot) = range(20)
+        n = S.size
+        idx = np.arange(n)
+        J = np.zeros([20, n, 20, n])
+
+        def add(row, col, value):
+            """add value to the (age-diagonal) block of d(row)/d(col)"""
+            J[row, idx, col, idx] += value
+
+        # population and test rate, as in integrate
+        N = S + E + I + A + M + ER + C + C_icurec + ICU + R + SQ + EQ + IQ + AQ + MQ + RQ
+        nT = S + E + I + A + M + R
+        # (with the same guards for empty age bins, which get zero derivatives)
+        rate = np.divide(totalTests, nT, out=np.ones_like(nT), where=nT>0)
+        theta = np.minimum(rate, 1)
+        # derivative of theta to every pool in nT (zero once the tests exceed the pool)
+        dtheta = -np.divide(rate, nT, out=np.zeros_like(nT), where=rate<1)
+
+        # new infections: beta*s*Nc@((I+A)/N*S), the force of infection couples the age groups
+        inv_N = np.divide(1, N, out=np.zeros_like(N), where=N>0)
+        infectious = (I+A)*inv_N
+        df = -infectious*S*inv_N
+        dinfection = {}
+        for state in [iE, iM, iER, iC, iC_icurec, iICU, iR, iSQ, iEQ, iIQ, iAQ, iMQ, iRQ]:
+            dinfection[state] = df
+        dinfection[iS] = infectious + df
+        dinfection[iI] = S*inv_N + df
+        dinfection[iA] = S*inv_N + df
+        for state, value in dinfection.items():
+            block = beta*s[:,np.newaxis]*Nc*value[np.newaxis,:]
+            J[iS,:,state,:] -= block
+            J[iE,:,state,:] += block
+
+        # testing: (row, sign, psi, tested pool)
+        for row, sign, psi, pool in [(iS, -1, psi_FP, iS), (iE, -1, psi_PP, iE), (iI, -1, psi_PP, iI),
+                                     (iA, -1, psi_PP, iA), (iM, -1, psi_PP, iM), (iSQ, 1, psi_FP, iS),
+                                     (iEQ, 1, psi_PP, iE), (iIQ, 1, psi_PP, iI), (iAQ, 1, psi_PP, iA),
+                                     (iMQ, 1, psi_PP, iM), (iRQ, 1, psi_FP, iR)]:
+            X = [S, E, I, A, M, R][[iS, iE, iI, iA, iM, iR].index(pool)]
+            add(row, pool, sign*psi*theta)
+            for state in [iS, iE, iI, iA, iM, iR]:
+                add(row, state, sign*psi*X*dtheta)
+
+        # all other (linear) transitions
+        add(iS, iSQ, 1/dq)
+        add(iS, iR, zeta)
+        add(iE, iE, -1/sigma)
+        add(iI, iE, 1/sigma)
+        add(iI, iI, -1/omega)
+        add(iA, iI, a/omega)
+        add(iA, iA, -1/da)
+        add(iM, iI, (1-a)/omega)
+        add(iM, iM, -(1-h)/dm - h/dhospital)
+        add(iER, iM, h/dhospital)
+        add(iER, iMQ, h/dhospital)
+        add(iER, iER, -1/der)
+        add(iC, iER, c/der)
+        add(iC, iC, -(1-m0_C)/dc_R - m0_C/dc_D)
+        add(iC_icurec, iICU, (1-m0_ICU)/dICU_R)
+        add(iC_icurec, iC_icurec, -1/dICUrec)
+        add(iICU, iER, (1-c)/der)
+        add(iICU, iICU, -(1-m0_ICU)/dICU_R - m0_ICU/dICU_D)
+        add(iR, iA, 1/da)
+        add(iR, iM, (1-h)/dm)
+        add(iR, iC, (1-m0_C)/dc_R)
+        add(iR, iC_icurec, 1/dICUrec)
+        add(iR, iAQ, 1/dq)
+        add(iR, iMQ, (1-h)/dm)
+        add(iR, iRQ, 1/dq)
+        add(iR, iR, -zeta)
+        add(iD, iICU, m0_ICU/dICU_D)
+        add(iD, iC, m0_C/dc_D)
+        add(iSQ, iSQ, -1/dq)
+        add(iEQ, iEQ, -1/sigma)
+        add(iIQ, iEQ, 1/sigma)
+        add(iIQ, iIQ, -1/omega)
+        add(iAQ, iIQ, a/omega)
+        add(iAQ, iAQ, -1/dq)
+        add(iMQ, iIQ, (1-a)/omega)
+        add(iMQ, iMQ, -(1-h)/dm - h/dhospital)
+        add(iRQ, iRQ, -1/dq)
+        add(iH_in, iM, h/dhospital)
+        add(iH_in, iMQ, h/dhospital)
+        add(iH_in, iH_in, -1)
+        add(iH_out, iC, (1-m0_C)/dc_R + m0_C/dc_D)
+        add(iH_out, iICU, m0_ICU/dICU_D)
+        add(iH_out, iC_icurec, 1/dICUrec)
+        add(iH_out, iH_out, -1)
+        add(iH_tot, iM, h/dhospital)
+        add(iH_tot, iMQ, h/dhospital)
+        add(iH_tot, iC, -(1-m0_C)/dc_R - m0_C/dc_D)
+        add(iH_tot, iICU, -m0_ICU/dICU_D)
+        add(iH_tot, iC_icurec, -1/dICUrec)
+
+        return J.reshape(20*n, 20*n)
+
 class COVID19_SEIRD_sto(BaseModel):
     """
     Biomath extended SEIRD model for COVID-19
@@ -210,42 +326,42 @@ class COVID19_SEIRD_sto(BaseModel):
         n = 12
         # calculate total population per age bin using 2D array
         N = S + E + I + A + M + C + C_icurec + ICU + R
+        # infectious fraction per age bin (zero for an empty age bin, instead of a nan that spreads through Nc)
+        infectious = np.divide(I+A, N, out=np.zeros_like(N), where=N>0)
 
         # Make a dictionary containing the propensities of the system
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # (probabilities that are the same for all age groups stay scalars and are broadcast when drawing)
         keys = ['StoE','EtoI','ItoA','ItoM','AtoR','MtoR','MtoC','MtoICU','CtoR','ICUtoCicurec','CicurectoR','CtoD','ICUtoD','RtoS']
-        probabilities = [1 - np.exp( - l*s*beta*np.matmul(Nc,((I+A)/N)) ),
-                        (1 - np.exp(- l * (1/sigma) ))*np.ones(S.size),
+        probabilities = [1 - np.exp( - l*s*beta*np.matmul(Nc,infectious) ),
+                        (1 - np.exp(- l * (1/sigma) )),
                         1 - np.exp(- l * a * (1/omega) ),
                         1 - np.exp(- l * m * (1/omega) ),
-                        (1 - np.exp(- l * (1/da) ))*np.ones(S.size),
-                        (1 - np.exp(- l * (1/dm) ))*np.ones(S.size),
+                        (1 - np.exp(- l * (1/da) )),
+                        (1 - np.exp(- l * (1/dm) )),
                         1 - np.exp(- l * h * c * (1/dhospital) ),
                         1 - np.exp(- l * h * (1-c) * (1/dhospital) ),
-                        (1 - np.exp(- l * (1-m0) * (1/dc) ))*np.ones(S.size),
-                        (1 - np.exp(- l * (1-m0) * (1/dICU) ))*np.ones(S.size),
-                        (1 - np.exp(- l * (1/dICUrec) ))*np.ones(S.size),
-                        (1 - np.exp(- l * m0 * (1/dc) ))*np.ones(S.size),
-                        (1 - np.exp(- l * m0 * (1/dICU) ))*np.ones(S.size),
-                        (1 - np.exp(- l * zeta ))*np.ones(S.size),
+                        (1 - np.exp(- l * (1-m0) * (1/dc) )),
+                        (1 - np.exp(- l * (1-m0) * (1/dICU) )),
+                        (1 - np.exp(- l * (1/dICUrec) )),
+                        (1 - np.exp(- l * m0 * (1/dc) )),
+                        (1 - np.exp(- l * m0 * (1/dICU) )),
+                        (1 - np.exp(- l * zeta )),
                         ]
         states = [S,E,I,I,A,M,M,M,C,ICU,C_icurec,C,ICU,R]
         propensity={}
         for i in range(len(keys)):
-            prop=[]
-            for j in range(S.size):
-                if states[i][j]<=0:
-                    prop.append(0)
-                else:
-                    draw=np.array([])
-                    for l in range(n):
-                        if i == 1:
-                            draw = np.append(draw,sample_beta_binomial(states[i][j],probabilities[i][j],d))
-                        else:
-                            draw = np.append(draw,np.random.binomial(states[i][j],probabilities[i][j]))
-                    draw = np.rint(np.mean(draw))
-                    prop.append( draw )
-            propensity.update({keys[i]: np.asarray(prop)})
+            # only pools with a positive number of individuals make transitions,
+            # the others draw from an empty pool with a valid dummy probability
+            mask = states[i] > 0
+            pool = np.where(mask, states[i], 0).astype(np.int64)
+            probability = np.where(mask, probabilities[i], 0.5)
+            # take all n draws of all age groups at once
+            if i == 1:
+                draw = sample_beta_binomial(pool,probability,d,size=(n,S.size))
+            else:
+                draw = np.random.binomial(pool,probability,size=(n,S.size))
+            propensity.update({keys[i]: np.rint(np.mean(draw,axis=0))})
 
         # calculate the states at timestep k+1
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -266,10 +382,7 @@ class COVID19_SEIRD_sto(BaseModel):
         # protection against states < 0
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         output = (S_new, E_new, I_new, A_new, M_new, C_new, C_icurec_new,ICU_new, R_new, D_new,H_in_new,H_out_new)
-        for i in range(len(output)):
-            output[i][output[i]<0] = 0
-
-        return output
+        return tuple(np.maximum(state, 0) for state in output)
 
 
 class SEIRSAgeModel():
@@ -450,65 +563,50 @@ class SEIRSAgeModel():
     def system_dfes(t, variables, beta, sigma,omega, Nc, zeta, a, m, h, c, da, dm, dc, dICU, dICUrec, dhospital, m0, ICU, totalTests, psi_FP, psi_PP, dq):
 
         # input is a 1D-array
-        # first extract seperate variables in 1D-array
-        S,E,I,A,M,C,Cicurec,ICU,R,D,SQ,EQ,IQ,AQ,MQ,RQ = variables.reshape(16,Nc.shape[0])
+        # extract the seperate variables as Nc.shape[0]x1 2D-array views of the input at once
+        S,E,I,A,M,C,Cicurec,ICU,R,D,SQ,EQ,IQ,AQ,MQ,RQ = variables.reshape(16,Nc.shape[0],1)
         # reshape all age dependent parameters to a Nc.shape[0]x1 2D-array
         a = numpy.reshape(a,[Nc.shape[0],1])
         m = numpy.reshape(m,[Nc.shape[0],1])
         h = numpy.reshape(h,[Nc.shape[0],1])
         c = numpy.reshape(c,[Nc.shape[0],1])
         m0 = numpy.reshape(m0,[Nc.shape[0],1])
-        # reshape all variables to a Nc.shape[0]x1 2D-array
-        S = numpy.reshape(S,[Nc.shape[0],1])
-        E = numpy.reshape(E,[Nc.shape[0],1])
-        I = numpy.reshape(I,[Nc.shape[0],1])
-        A = numpy.reshape(A,[Nc.shape[0],1])
-        M = numpy.reshape(M,[Nc.shape[0],1])
-        C = numpy.reshape(C,[Nc.shape[0],1])
-        Cicurec = numpy.reshape(Cicurec,[Nc.shape[0],1])
-        ICU = numpy.reshape(ICU,[Nc.shape[0],1])
-        R = numpy.reshape(R,[Nc.shape[0],1])
-        D = numpy.reshape(D,[Nc.shape[0],1])
-        SQ = numpy.reshape(SQ,[Nc.shape[0],1])
-        EQ = numpy.reshape(EQ,[Nc.shape[0],1])
-        IQ = numpy.reshape(IQ,[Nc.shape[0],1])
-        AQ = numpy.reshape(AQ,[Nc.shape[0],1])
-        MQ = numpy.reshape(MQ,[Nc.shape[0],1])
-        RQ = numpy.reshape(RQ,[Nc.shape[0],1])
         Ctot = C + Cicurec
         # calculate total population per age bin using 2D array
         N   = S + E + I + A + M + Ctot + ICU + R + SQ + EQ + IQ + AQ + MQ + RQ
         # calculate the test rates for each pool using the total number of available tests
         nT = S + E + I + A + M + R
-        theta_S = totalTests/nT
-        theta_S[theta_S > 1] = 1
-        theta_E = totalTests/nT
-        theta_E[theta_E > 1] = 1
-        theta_I = totalTests/nT
-        theta_I[theta_I > 1] = 1
-        theta_A = totalTests/nT
-        theta_A[theta_A > 1] = 1
-        theta_M = totalTests/nT
-        theta_M[theta_M > 1] = 1
-        theta_R = totalTests/nT
-        theta_R[theta_R > 1] = 1
+        # the test rate is the same for every pool
+        theta = numpy.minimum(totalTests/nT, 1)
+        # new infections, shared by dS and dE
+        infection = beta*numpy.matmul(Nc,((I+A)/N)*S)
+        # rates and flows that appear in more than one equation
+        inv_sigma = 1/sigma
+        inv_omega = 1/omega
+        a_omega = a/omega
+        m_omega = m/omega
+        h_R = (1-h)/dm
+        h_hospital = h/dhospital
+        hospitalised = (M+MQ)*h_hospital
+        C_R = C*(1/dc)
+        Cicurec_R = Cicurec*(1/dICUrec)
         # calculate rates of change using the 2D arrays
-        dS  = - beta*numpy.matmul(Nc,((I+A)/N)*S) - theta_S*psi_FP*S + SQ/dq + zeta*R
-        dE  = beta*numpy.matmul(Nc,((I+A)/N)*S) - E/sigma - theta_E*psi_PP*E
-        dI = (1/sigma)*E - (1/omega)*I - theta_I*psi_PP*I
-        dA = (a/omega)*I - A/da - theta_A*psi_PP*A
-        dM = (m/omega)*I - M*((1-h)/dm) - M*h/dhospital - theta_M*psi_PP*M
-        dC = c*(M+MQ)*(h/dhospital) - C*(1/dc)
-        dICUstar = (1-c)*(M+MQ)*(h/(dhospital)) - ICU/dICU
-        dCicurec = ((1-m0)/dICU)*ICU - Cicurec*(1/dICUrec)
-        dR  = A/da + ((1-h)/dm)*M + C*(1/dc) + Cicurec*(1/dICUrec) + AQ/dq + MQ*((1-h)/dm) + RQ/dq - zeta*R
+        dS  = - infection - theta*psi_FP*S + SQ/dq + zeta*R
+        dE  = infection - E/sigma - theta*psi_PP*E
+        dI = inv_sigma*E - inv_omega*I - theta*psi_PP*I
+        dA = a_omega*I - A/da - theta*psi_PP*A
+        dM = m_omega*I - M*h_R - M*h_hospital - theta*psi_PP*M
+        dC = c*hospitalised - C_R
+        dICUstar = (1-c)*hospitalised - ICU/dICU
+        dCicurec = ((1-m0)/dICU)*ICU - Cicurec_R
+        dR  = A/da + h_R*M + C_R + Cicurec_R + AQ/dq + MQ*h_R + RQ/dq - zeta*R
         dD  = (m0/dICU)*ICU
-        dSQ = theta_S*psi_FP*S - SQ/dq
-        dEQ = theta_E*psi_PP*E - EQ/sigma
-        dIQ = theta_I*psi_PP*I + (1/sigma)*EQ - (1/omega)*IQ
-        dAQ = theta_A*psi_PP*A + (a/omega)*IQ - AQ/dq
-        dMQ = theta_M*psi_PP*M + (m/omega)*IQ - ((1-h)/dm)*MQ - (h/dhospital)*MQ
-        dRQ = theta_R*psi_FP*R - RQ/dq
+        dSQ = theta*psi_FP*S - SQ/dq
+        dEQ = theta*psi_PP*E - EQ/sigma
+        dIQ = theta*psi_PP*I + inv_sigma*EQ - inv_omega*IQ
+        dAQ = theta*psi_PP*A + a_omega*IQ - AQ/dq
+        dMQ = theta*psi_PP*M + m_omega*IQ - h_R*MQ - h_hospital*MQ
+        dRQ = theta*psi_FP*R - RQ/dq
         # reshape output back into a 1D array of similar dimension as input
         out = numpy.array([dS,dE,dI,dA,dM,dC,dCicurec,dICUstar,dR,dD,dSQ,dEQ,dIQ,dAQ,dMQ,dRQ])
         out = numpy.reshape(out,16*Nc.shape[0])
@@ -522,14 +620,63 @@ class SEIRSAgeModel():
         return f
 
     def compliance_fcn(self,time,old_Nc,final_Nc,k,t0):
-        new_Nc = numpy.zeros([old_Nc.shape[0],old_Nc.shape[1]])
-        for i in range(old_Nc.shape[0]):
-            for j in range(old_Nc.shape[1]):
-                new_Nc[i,j] = old_Nc[i,j] + self.logistic(time,1,k,t0)*(final_Nc[i,j]-old_Nc[i,j])
+        # the logistic weight is the same for every matrix element
+        new_Nc = old_Nc + self.logistic(time,1,k,t0)*(final_Nc-old_Nc)
         return new_Nc
 
+    def append_solution(self, tseries, y):
+        # output of size (nTimesteps * Nc.shape[0])
+        S,E,I,A,M,C,Cicurec,ICU,R,F,SQ,EQ,IQ,AQ,MQ,RQ = numpy.split(numpy.transpose(y),16,axis=1)
+        Ctot = C + Cicurec
+
+        # calculate hospital in and hospital out
+        h = self.h
+        c = self.c
+        m0 = self.m0
+        dhospital = self.dhospital
+        dc = self.dc
+        dICU = self.dICU
+        dICUrec = self.dICUrec
+        H_in = (M+MQ)*(h/dhospital)
+        H_out = C*(1/dc) + (m0/dICU)*ICU + Cicurec*(1/dICUrec)
+
+        #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # Store the solution output as the model's time series and data series:
+        #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+        # transpose before appending
+        # append per category:
+        self.tseries    = numpy.append(self.tseries, tseries)
+        self.numS       = numpy.append(self.numS, numpy.transpose(S),axis=1)
+        self.numE       = numpy.append(self.numE, numpy.transpose(E),axis=1)
+        self.numI       = numpy.append(self.numI, numpy.transpose(I),axis=1)
+        self.numA       = numpy.append(self.numA, numpy.transpose(A),axis=1)
+        self.numM       = numpy.append(self.numM, numpy.transpose(M),axis=1)
+        self.numCtot    = numpy.append(self.numCtot, numpy.transpose(Ctot),axis=1)
+        self.numC       = numpy.append(self.numC, numpy.transpose(C),axis=1)
+        self.numCicurec = numpy.append(self.numCicurec, numpy.transpose(Cicurec),axis=1)
+        self.numICU     = numpy.append(self.numICU, numpy.transpose(ICU),axis=1)
+        self.numR       = numpy.append(self.numR, numpy.transpose(R),axis=1)
+        self.numD       = numpy.append(self.numD, numpy.transpose(F),axis=1)
+        self.numSQ      = numpy.append(self.numSQ, numpy.transpose(SQ),axis=1)
+        self.numEQ      = numpy.append(self.numEQ, numpy.transpose(EQ),axis=1)
+        self.numAQ      = numpy.append(self.numAQ, numpy.transpose(AQ),axis=1)
+        self.numMQ      = numpy.append(self.numMQ, numpy.transpose(MQ),axis=1)
+        self.numRQ      = numpy.append(self.numRQ, numpy.transpose(RQ),axis=1)
+        self.t = self.tseries[-1]
+        self.numH_in      = numpy.append(self.numH_in, numpy.transpose(H_in),axis=1)
+        self.numH_out      = numpy.append(self.numH_out, numpy.transpose(H_out),axis=1)
+
     def run_epoch(self, runtime, dt=1):
+        # Define the initial conditions as the system's current state:
+        # (which will be the t=0 condition if this is the first run of this model,
+        # else where the last sim left off)
+        init_cond = numpy.array([self.numS[:,-1], self.numE[:,-1], self.numI[:,-1], self.numA[:,-1], self.numM[:,-1], self.numC[:,-1],self.numCicurec[:,-1], self.numICU[:,-1], self.numR[:,-1], self.numD[:,-1], self.numSQ[:,-1], self.numEQ[:,-1],self.numIQ[:,-1], self.numAQ[:,-1], self.numMQ[:,-1], self.numRQ[:,-1]])
+        init_cond = numpy.reshape(init_cond,16*self.Nc.shape[0])
         if self.compliance == True:
+            # the daily solutions are collected and appended to the output at once,
+            # appending them one day at a time copies the entire output every day
+            tseries_lst = []
+            y_lst = []
             timer = 0
             while timer < runtime:
                 timer = timer + 1
@@ -537,49 +684,19 @@ class SEIRSAgeModel():
                 # Repeat normal run_epoch function but using 1 day as the timestep
                 t_eval    = numpy.arange(start=self.t+1, stop=self.t+2, step=dt)
                 t_span          = (self.t, self.t+1)
-                init_cond = numpy.array([self.numS[:,-1], self.numE[:,-1], self.numI[:,-1], self.numA[:,-1], self.numM[:,-1], self.numC[:,-1],self.numCicurec[:,-1], self.numICU[:,-1], self.numR[:,-1], self.numD[:,-1], self.numSQ[:,-1], self.numEQ[:,-1],self.numIQ[:,-1], self.numAQ[:,-1], self.numMQ[:,-1], self.numRQ[:,-1]])
-                init_cond = numpy.reshape(init_cond,16*self.Nc.shape[0])
                 solution        = scipy.integrate.solve_ivp(lambda t, X: SEIRSAgeModel.system_dfes(t, X, self.beta, self.sigma, self.omega, self.Nc, self.zeta, self.a, self.m, self.h, self.c, self.da,
                                     self.dm, self.dc,self.dICU,self.dICUrec,self.dhospital,self.m0,self.ICU,self.totalTests,self.psi_FP,self.psi_PP,self.dq), t_span=[self.t, self.tmax], y0=init_cond, t_eval=t_eval)
-                S,E,I,A,M,C,Cicurec,ICU,R,F,SQ,EQ,IQ,AQ,MQ,RQ = numpy.split(numpy.transpose(solution['y']),16,axis=1)
-                Ctot = C + Cicurec
-                # calculate hospital in and hospital out
-                h = self.h
-                c = self.c
-                m0 = self.m0
-                dhospital = self.dhospital
-                dc = self.dc
-                dICU = self.dICU
-                dICUrec = self.dICUrec
-                H_in=numpy.zeros([len(M),self.Nc.shape[0]])
-                H_out=numpy.zeros([len(M),self.Nc.shape[0]])
-                for i in range(len(H_in)):
-                    H_in[i,:]=(M[i,:]+MQ[i,:])*(h/dhospital)
-                    H_out[i,:] =  C[i,:]*(1/dc) + (m0/dICU)*ICU[i,:] + Cicurec[i,:]*(1/dICUrec)
-                # append output
-                self.tseries    = numpy.append(self.tseries, solution['t'])
-                self.numS       = numpy.append(self.numS, numpy.transpose(S),axis=1)
-                self.numE       = numpy.append(self.numE, numpy.transpose(E),axis=1)
-                self.numI       = numpy.append(self.numI, numpy.transpose(I),axis=1)
-                self.numA       = numpy.append(self.numA, numpy.transpose(A),axis=1)
-                self.numM       = numpy.append(self.numM, numpy.transpose(M),axis=1)
-                self.numCtot    = numpy.append(self.numCtot, numpy.transpose(Ctot),axis=1)
-                self.numC       = numpy.append(self.numC, numpy.transpose(C),axis=1)
-                self.numCicurec = numpy.append(self.numCicurec, numpy.transpose(Cicurec),axis=1)
-                self.numICU     = numpy.append(self.numICU, numpy.transpose(ICU),axis=1)
-                self.numR       = numpy.append(self.numR, numpy.transpose(R),axis=1)
-                self.numD       = numpy.append(self.numD, numpy.transpose(F),axis=1)
-                self.numSQ      = numpy.append(self.numSQ, numpy.transpose(SQ),axis=1)
-                self.numEQ      = numpy.append(self.numEQ, numpy.transpose(EQ),axis=1)
-                self.numAQ      = numpy.append(self.numAQ, numpy.transpose(AQ),axis=1)
-                self.numMQ      = numpy.append(self.numMQ, numpy.transpose(MQ),axis=1)
-                self.numRQ      = numpy.append(self.numRQ, numpy.transpose(RQ),axis=1)
-                self.t = self.tseries[-1]
-                self.numH_in      = numpy.append(self.numH_in, numpy.transpose(H_in),axis=1)
-                self.numH_out      = numpy.append(self.numH_out, numpy.transpose(H_out),axis=1)
-                #print(self.numH_out.shape,self.t)
+                tseries_lst.append(solution['t'])
+                y_lst.append(solution['y'])
+                self.t = solution['t'][-1]
+                # continue from the last state (IQ is not part of the stored output and keeps its stored value)
+                IQ = init_cond[12*self.Nc.shape[0]:13*self.Nc.shape[0]]
+                init_cond = solution['y'][:,-1].copy()
+                init_cond[12*self.Nc.shape[0]:13*self.Nc.shape[0]] = IQ
             else:
                 self.compliance = False
+            if tseries_lst:
+                self.append_solution(numpy.concatenate(tseries_lst), numpy.concatenate(y_lst,axis=1))
         else:
             #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
             # Create a list of times at which the ODE solver should output system values.
@@ -589,12 +706,6 @@ class SEIRSAgeModel():
             # Define the range of time values for the integration:
             t_span          = (self.t, self.t+runtime)
 
-            # Define the initial conditions as the system's current state:
-            # (which will be the t=0 condition if this is the first run of this model,
-            # else where the last sim left off)
-            init_cond = numpy.array([self.numS[:,-1], self.numE[:,-1], self.numI[:,-1], self.numA[:,-1], self.numM[:,-1], self.numC[:,-1],self.numCicurec[:,-1], self.numICU[:,-1], self.numR[:,-1], self.numD[:,-1], self.numSQ[:,-1], self.numEQ[:,-1],self.numIQ[:,-1], self.numAQ[:,-1], self.numMQ[:,-1], self.numRQ[:,-1]])
-            init_cond = numpy.reshape(init_cond,16*self.Nc.shape[0])
-
             #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
             # Solve the system of differential eqns:
             #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -602,49 +713,7 @@ class SEIRSAgeModel():
             solution        = scipy.integrate.solve_ivp(lambda t, X: SEIRSAgeModel.system_dfes(t, X, self.beta, self.sigma, self.omega, self.Nc, self.zeta, self.a, self.m, self.h, self.c, self.da,
             self.dm, self.dc,self.dICU,self.dICUrec,self.dhospital,self.m0,self.ICU,self.totalTests,self.psi_FP,self.psi_PP,self.dq), t_span=[self.t, self.tmax], y0=init_cond, t_eval=t_eval)
 
-            # output of size (nTimesteps * Nc.shape[0])
-            S,E,I,A,M,C,Cicurec,ICU,R,F,SQ,EQ,IQ,AQ,MQ,RQ = numpy.split(numpy.transpose(solution['y']),16,axis=1)
-            Ctot = C + Cicurec
-
-            # calculate hospital in and hospital out
-            h = self.h
-            c = self.c
-            m0 = self.m0
-            dhospital = self.dhospital
-            dc = self.dc
-            dICU = self.dICU
-            dICUrec = self.dICUrec
-            H_in=numpy.zeros([len(M),self.Nc.shape[0]])
-            H_out=numpy.zeros([len(M),self.Nc.shape[0]])
-            for i in range(len(H_in)):
-                H_in[i,:]=(M[i,:]+MQ[i,:])*(h/dhospital)
-                H_out[i,:] =  C[i,:]*(1/dc) + (m0/dICU)*ICU[i,:] + Cicurec[i,:]*(1/dICUrec)
-
-            #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-            # Store the solution output as the model's time series and data series:
-            #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-            # transpose before appending
-            # append per category:
-            self.tseries    = numpy.append(self.tseries, solution['t'])
-            self.numS       = numpy.append(self.numS, numpy.transpose(S),axis=1)
-            self.numE       = numpy.append(self.numE, numpy.transpose(E),axis=1)
-            self.numI       = numpy.append(self.numI, numpy.transpose(I),axis=1)
-            self.numA       = numpy.append(self.numA, numpy.transpose(A),axis=1)
-            self.numM       = numpy.append(self.numM, numpy.transpose(M),axis=1)
-            self.numCtot    = numpy.append(self.numCtot, numpy.transpose(Ctot),axis=1)
-            self.numC       = numpy.append(self.numC, numpy.transpose(C),axis=1)
-            self.numCicurec = numpy.append(self.numCicurec, numpy.transpose(Cicurec),axis=1)
-            self.numICU     = numpy.append(self.numICU, numpy.transpose(ICU),axis=1)
-            self.numR       = numpy.append(self.numR, numpy.transpose(R),axis=1)
-            self.numD       = numpy.append(self.numD, numpy.transpose(F),axis=1)
-            self.numSQ      = numpy.append(self.numSQ, numpy.transpose(SQ),axis=1)
-            self.numEQ      = numpy.append(self.numEQ, numpy.transpose(EQ),axis=1)
-            self.numAQ      = numpy.append(self.numAQ, numpy.transpose(AQ),axis=1)
-            self.numMQ      = numpy.append(self.numMQ, numpy.transpose(MQ),axis=1)
-            self.numRQ      = numpy.append(self.numRQ, numpy.transpose(RQ),axis=1)
-            self.t = self.tseries[-1]
-            self.numH_in      = numpy.append(self.numH_in, numpy.transpose(H_in),axis=1)
-            self.numH_out      = numpy.append(self.numH_out, numpy.transpose(H_out),axis=1)
+            self.append_solution(solution['t'], solution['y'])
 
 #^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
 #^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
@@ -663,10 +732,11 @@ class SEIRSAgeModel():
             numCheckpoints = len(checkpoints['t'])
             paramNames = ['beta', 'sigma', 'Nc', 'zeta', 'a', 'm', 'h', 'c','da','dm','dc','dICU','dICUrec','dhospital','m0','totalTests',
                           'psi_FP','psi_PP','dq']
+            checkpointNames = set(checkpoints.keys())
             for param in paramNames:
                 # For params that don't have given checkpoint values (or bad value given),
                 # set their checkpoint values to the value they have now for all checkpoints.
-                if(param not in list(checkpoints.keys())
+                if(param not in checkpointNames
                     or not isinstance(checkpoints[param], (list, numpy.ndarray))
                     or len(checkpoints[param])!=numCheckpoints):
                     checkpoints[param] = [getattr(self, param)]*numCheckpoints
@@ -763,61 +833,39 @@ class SEIRSAgeModel():
         else:
             self.n_samples = 1
 
-        # pre-allocate a 3D matrix for the raw results
-        self.S = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.E = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.I = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.A = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.M = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.C = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.Cicurec = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.Ctot = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.ICU = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.R = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.D = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.SQ = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.EQ = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.IQ = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.AQ = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.MQ = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.RQ = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.H_in = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        self.H_out = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        # total hospitalised
-        self.H = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        # total infected
-        self.InfTot = numpy.zeros([self.Nc.shape[0],tN,self.n_samples])
-        # pre-allocate a 2D matrix for the results summed over all age bins
-        self.sumS = numpy.zeros([tN,self.n_samples])
-        self.sumE = numpy.zeros([tN,self.n_samples])
-        self.sumI = numpy.zeros([tN,self.n_samples])
-        self.sumA = numpy.zeros([tN,self.n_samples])
-        self.sumM = numpy.zeros([tN,self.n_samples])
-        self.sumC = numpy.zeros([tN,self.n_samples])
-        self.sumCicurec = numpy.zeros([tN,self.n_samples])
-        self.sumCtot = numpy.zeros([tN,self.n_samples])
-        self.sumICU = numpy.zeros([tN,self.n_samples])
-        self.sumR = numpy.zeros([tN,self.n_samples])
-        self.sumD = numpy.zeros([tN,self.n_samples])
-        self.sumSQ = numpy.zeros([tN,self.n_samples])
-        self.sumEQ = numpy.zeros([tN,self.n_samples])
-        self.sumIQ = numpy.zeros([tN,self.n_samples])
-        self.sumAQ = numpy.zeros([tN,self.n_samples])
-        self.sumMQ = numpy.zeros([tN,self.n_samples])
-        self.sumRQ = numpy.zeros([tN,self.n_samples])
-        self.sumH_in = numpy.zeros([tN,self.n_samples])
-        self.sumH_out = numpy.zeros([tN,self.n_samples])
+        # pre-allocate a 3D matrix for the raw results (every entry is overwritten in the simulation loop)
+        self.S = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.E = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.I = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.A = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.M = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.C = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.Cicurec = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.Ctot = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.ICU = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.R = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.D = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.SQ = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.EQ = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.IQ = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.AQ = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.MQ = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.RQ = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.H_in = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        self.H_out = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
         # total hospitalised
-        self.sumH = numpy.zeros([tN,self.n_samples])
+        self.H = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
         # total infected
-        self.sumInfTot = numpy.zeros([tN,self.n_samples])
+        self.InfTot = numpy.empty([self.Nc.shape[0],tN,self.n_samples])
+        # convert the traces to arrays once and draw the sample indices of all simulations up front
+        if trace is not None:
+            trace = {key: numpy.asarray(value) for key, value in trace.items()}
+            trace_idx = {key: numpy.random.randint(value.shape[0], size=self.n_samples) for key, value in trace.items()}
         # simulation loop
         for i in range(self.n_samples):
             if trace is not None:
                 for key in trace.keys():
-                    lst = list(trace[key])
-                    param=random.sample(lst, 1)
-                    setattr(self,key,random.sample(lst, 1)[0])
+                    setattr(self,key,trace[key][trace_idx[key][i]])
 
             # reset self to initial conditioin
             self.reset()
@@ -847,30 +895,30 @@ class SEIRSAgeModel():
             self.H[:,:,i] = self.numCtot + self.numICU
             # total infected
             self.InfTot[:,:,i] = self.numCtot +  self.numICU + self.numI + self.numA + self.numM
-            # convert raw results to sums of all age categories
-            self.sumS[:,i] = self.numS.sum(axis=0)
-            self.sumE[:,i] = self.numE.sum(axis=0)
-            self.sumI[:,i] = self.numI.sum(axis=0)
-            self.sumA[:,i] = self.numA.sum(axis=0)
-            self.sumM[:,i] = self.numM.sum(axis=0)
-            self.sumC[:,i] = self.numC.sum(axis=0)
-            self.sumCicurec[:,i] = self.numCicurec.sum(axis=0)
-            self.sumCtot[:,i] = self.numCtot.sum(axis=0)
-            self.sumICU[:,i] = self.numICU.sum(axis=0)
-            self.sumR[:,i] = self.numR.sum(axis=0)
-            self.sumD[:,i] = self.numD.sum(axis=0)
-            self.sumSQ[:,i] = self.numSQ.sum(axis=0)
-            self.sumEQ[:,i] = self.numEQ.sum(axis=0)
-            self.sumIQ[:,i] = self.numIQ.sum(axis=0)
-            self.sumAQ[:,i] = self.numAQ.sum(axis=0)
-            self.sumMQ[:,i] = self.numMQ.sum(axis=0)
-            self.sumRQ[:,i] = self.numRQ.sum(axis=0)
-            self.sumH_in[:,i] = self.numH_in.sum(axis=0)
-            self.sumH_out[:,i] = self.numH_out.sum(axis=0)
-            # total hospitalised
-            self.sumH[:,i] = self.numCtot.sum(axis=0) + self.numICU.sum(axis=0)
-            # total infected
-            self.sumInfTot[:,i] = self.numCtot.sum(axis=0) + self.numICU.sum(axis=0)+ self.numI.sum(axis=0) + self.numA.sum(axis=0) + self.numM.sum(axis=0)
+        # convert raw results to sums of all age categories
+        self.sumS = self.S.sum(axis=0)
+        self.sumE = self.E.sum(axis=0)
+        self.sumI = self.I.sum(axis=0)
+        self.sumA = self.A.sum(axis=0)
+        self.sumM = self.M.sum(axis=0)
+        self.sumC = self.C.sum(axis=0)
+        self.sumCicurec = self.Cicurec.sum(axis=0)
+        self.sumCtot = self.Ctot.sum(axis=0)
+        self.sumICU = self.ICU.sum(axis=0)
+        self.sumR = self.R.sum(axis=0)
+        self.sumD = self.D.sum(axis=0)
+        self.sumSQ = self.SQ.sum(axis=0)
+        self.sumEQ = self.EQ.sum(axis=0)
+        self.sumIQ = self.IQ.sum(axis=0)
+        self.sumAQ = self.AQ.sum(axis=0)
+        self.sumMQ = self.MQ.sum(axis=0)
+        self.sumRQ = self.RQ.sum(axis=0)
+        self.sumH_in = self.H_in.sum(axis=0)
+        self.sumH_out = self.H_out.sum(axis=0)
+        # total hospitalised
+        self.sumH = self.sumCtot + self.sumICU
+        # total infected
+        self.sumInfTot = self.sumCtot + self.sumICU + self.sumI + self.sumA + self.sumM
         return self
 
     def sampleFromDistribution(self,filename,k):
@@ -883,14 +931,14 @@ class SEIRSAgeModel():
         # extend with plotting data and using dates (extra argument startDate)
         fig, ax = plt.subplots()
         ax.plot(self.tseries,numpy.mean(self.sumS,axis=1),color=black)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumS,90,axis=1), numpy.percentile(self.sumS,10,axis=1),color=black,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumS,[90,10],axis=1),color=black,alpha=0.2,rasterized=True)
         ax.plot(self.tseries,numpy.mean(self.sumE,axis=1),color=orange)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumE,90,axis=1), numpy.percentile(self.sumE,10,axis=1),color=orange,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumE,[90,10],axis=1),color=orange,alpha=0.2,rasterized=True)
         #I = self.sumA + self.sumM + self.sumCtot + self.sumMi + self.sumICU
         ax.plot(self.tseries,numpy.mean(self.sumInfTot,axis=1),color=red)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumInfTot,90,axis=1), numpy.percentile(self.sumInfTot,10,axis=1),color=red,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumInfTot,[90,10],axis=1),color=red,alpha=0.2,rasterized=True)
         ax.plot(self.tseries,numpy.mean(self.sumR,axis=1),color=green)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumR,90,axis=1), numpy.percentile(self.sumR,10,axis=1),color=green,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumR,[90,10],axis=1),color=green,alpha=0.2,rasterized=True)
         ax.legend(('susceptible','exposed','total infected','immune'), loc="upper left", bbox_to_anchor=(1,1))
         ax.set_xlabel('days')
         ax.set_ylabel('number of patients')
@@ -917,17 +965,17 @@ class SEIRSAgeModel():
         fig, ax = plt.subplots()
         if asymptomatic is not False:
             ax.plot(self.tseries,numpy.mean(self.sumA,axis=1),color=blue)
-            ax.fill_between(self.tseries, numpy.percentile(self.sumA,90,axis=1), numpy.percentile(self.sumA,10,axis=1),color=blue,alpha=0.2)
+            ax.fill_between(self.tseries, *numpy.percentile(self.sumA,[90,10],axis=1),color=blue,alpha=0.2,rasterized=True)
         if mild is not False:
             ax.plot(self.tseries,numpy.mean(self.sumM,axis=1),color=green)
-            ax.fill_between(self.tseries, numpy.percentile(self.sumM,90,axis=1), numpy.percentile(self.sumM,10,axis=1),color=green,alpha=0.2)
+            ax.fill_between(self.tseries, *numpy.percentile(self.sumM,[90,10],axis=1),color=green,alpha=0.2,rasterized=True)
         #H = self.sumCtot + self.sumMi + self.sumICU
         ax.plot(self.tseries,numpy.mean(self.sumH,axis=1),color=orange)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumH,90,axis=1), numpy.percentile(self.sumH,10,axis=1),color=orange,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumH,[90,10],axis=1),color=orange,alpha=0.2,rasterized=True)
         ax.plot(self.tseries,numpy.mean(self.sumICU,axis=1),color=red)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumICU,90,axis=1), numpy.percentile(self.sumICU,10,axis=1),color=red,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumICU,[90,10],axis=1),color=red,alpha=0.2,rasterized=True)
         ax.plot(self.tseries,numpy.mean(self.sumD,axis=1),color=black)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumD,90,axis=1), numpy.percentile(self.sumD,10,axis=1),color=black,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumD,[90,10],axis=1),color=black,alpha=0.2,rasterized=True)
         if mild is not False and asymptomatic is not False:
             legend_labels = ('asymptomatic','mild','hospitalised','ICU','dead')
         elif mild is not False and asymptomatic is False:
@@ -993,7 +1041,7 @@ class SEIRSAgeModel():
         for i in range(n):
             som = 0
             for j in positions[i]:
-                som = som + numpy.mean(out[j],axis=1).reshape(numpy.mean(out[j],axis=1).size,1)
+                som = som + numpy.mean(out[j],axis=1)[:,None]
             ymodel.append(som[self.extraTime:,0].reshape(som[self.extraTime:,0].size,1))
             # calculate quadratic error
             SSE = SSE + weights[i]*sum((ymodel[i]-data[i])**2)
@@ -1084,8 +1132,7 @@ class SEIRSAgeModel():
             for j in positions[i]:
                 ymodel = ymodel + out[j]
             ax.plot(index_acc,numpy.mean(ymodel,axis=1),'--',color=modelClr[i])
-            ax.fill_between(index_acc,numpy.percentile(ymodel,95,axis=1),
-                 numpy.percentile(ymodel,5,axis=1),color=modelClr[i],alpha=0.2)
+            ax.fill_between(index_acc,*numpy.percentile(ymodel,[95,5],axis=1),color=modelClr[i],alpha=0.2,rasterized=True)
         # Attributes
         if legendText is not None:
             ax.legend(legendText, loc="upper left", bbox_to_anchor=(1,1))
@@ -1219,7 +1266,7 @@ class SEIRSAgeModel():
         for i in range(len(setpoints)):
             som = 0
             for j in positions[i]:
-                som = som + numpy.mean(out[j],axis=1).reshape(numpy.mean(out[j],axis=1).size,1)
+                som = som + numpy.mean(out[j],axis=1)[:,None]
             ymodel.append(som.reshape(som.size,1))
             # calculate error
         for i in range(len(ymodel)):
@@ -1286,18 +1333,18 @@ class SEIRSAgeModel():
         fig, ax = plt.subplots()
         if asymptomatic is not False:
             ax.plot(self.tseries,numpy.mean(self.sumA,axis=1),color=blue)
-            ax.fill_between(self.tseries, numpy.percentile(self.sumA,90,axis=1), numpy.percentile(self.sumA,10,axis=1),color=blue,alpha=0.2)
+            ax.fill_between(self.tseries, *numpy.percentile(self.sumA,[90,10],axis=1),color=blue,alpha=0.2,rasterized=True)
         if mild is not False:
             ax.plot(self.tseries,numpy.mean(self.sumM,axis=1),color=green)
-            ax.fill_between(self.tseries, numpy.percentile(self.sumM,90,axis=1), numpy.percentile(self.sumM,10,axis=1),color=green,alpha=0.2)
+            ax.fill_between(self.tseries, *numpy.percentile(self.sumM,[90,10],axis=1),color=green,alpha=0.2,rasterized=True)
         H = self.sumCtot + self.sumICU
         ax.plot(self.tseries,numpy.mean(H,axis=1),color=orange)
-        ax.fill_between(self.tseries, numpy.percentile(H,90,axis=1), numpy.percentile(H,10,axis=1),color=orange,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(H,[90,10],axis=1),color=orange,alpha=0.2,rasterized=True)
         icu = self.sumMi + self.sumICU
         ax.plot(self.tseries,numpy.mean(icu,axis=1),color=red)
-        ax.fill_between(self.tseries, numpy.percentile(icu,90,axis=1), numpy.percentile(icu,10,axis=1),color=red,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(icu,[90,10],axis=1),color=red,alpha=0.2,rasterized=True)
         ax.plot(self.tseries,numpy.mean(self.sumD,axis=1),color=black)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumD,90,axis=1), numpy.percentile(self.sumD,10,axis=1),color=black,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumD,[90,10],axis=1),color=black,alpha=0.2,rasterized=True)
         if mild is not False and asymptomatic is not False:
             legend_labels = ('asymptomatic','mild','hospitalised','ICU','dead')
         elif mild is not False and asymptomatic is False:
@@ -1327,6 +1374,13 @@ class SEIRSAgeModel():
         else:
             plt.show()
 
+    def copyPolicy(self,policy):
+        # mergeDict and the scenario functions only modify the lists of a policy dictionary,
+        # never the (interaction matrix) values inside them, so copying the lists suffices
+        if policy is None:
+            return None
+        return {key: copy.copy(value) for key,value in policy.items()}
+
     def mergeDict(self,T,dict1, dict2):
         # length of dict1 is needed later on
         orig_len = len(dict1['t'])
@@ -1372,9 +1426,9 @@ class SEIRSAgeModel():
         t_data = pd.date_range(startDate, freq='D', periods=data[0].size)
         T = len(t_data) + self.extraTime - 1 + int(T_extra) # number of datapoints
 
-        # make a deepcopy --> if you modify a python dictionary in a function it will be modified globally
-        dict1_orig = copy.deepcopy(pastPolicy)
-        dict2_orig = copy.deepcopy(futurePolicy)
+        # make a copy --> if you modify a python dictionary in a function it will be modified globally
+        dict1_orig = self.copyPolicy(pastPolicy)
+        dict2_orig = self.copyPolicy(futurePolicy)
 
         # add estimated extraTime to past policy vector
         for i in range(len(dict1_orig['t'])):
@@ -1415,8 +1469,7 @@ class SEIRSAgeModel():
             for j in positions[i]:
                 ymodel = ymodel + out[j]
             ax.plot(t_acc,numpy.mean(ymodel,axis=1),'--',color=modelClr[i])
-            ax.fill_between(t_acc,numpy.percentile(ymodel,95,axis=1),
-                 numpy.percentile(ymodel,5,axis=1),color=modelClr[i],alpha=0.3)
+            ax.fill_between(t_acc,*numpy.percentile(ymodel,[95,5],axis=1),color=modelClr[i],alpha=0.3,rasterized=True)
         # Attributes
         if legendText is not None:
             ax.legend(legendText, loc="upper left", bbox_to_anchor=(1,1))
@@ -1457,8 +1510,8 @@ class SEIRSAgeModel():
         t_data = pd.date_range(startDate, freq='D', periods=data[0].size)
         # Calculate length of data to obtain an initial simulation time
         T = len(t_data) + self.extraTime - 1 # number of datapoints
-        # make a deepcopy of pastPolicy
-        dict1_orig = copy.deepcopy(pastPolicy)
+        # make a copy of pastPolicy
+        dict1_orig = self.copyPolicy(pastPolicy)
         # add estimated extraTime to past policy vector
         for i in range(len(dict1_orig['t'])):
             dict1_orig['t'][i] = dict1_orig['t'][i] + self.extraTime - 1
@@ -1545,8 +1598,7 @@ class SEIRSAgeModel():
             for j in positions[i]:
                 ymodel = ymodel + out[j]
             ax.plot(t_acc,numpy.mean(ymodel,axis=1),'--',color=modelClr[i])
-            ax.fill_between(t_acc,numpy.percentile(ymodel,95,axis=1),
-                 numpy.percentile(ymodel,5,axis=1),color=modelClr[i],alpha=0.2)
+            ax.fill_between(t_acc,*numpy.percentile(ymodel,[95,5],axis=1),color=modelClr[i],alpha=0.2,rasterized=True)
         # Attributes
         if legendText is not None:
             ax.legend(legendText, loc="upper left", bbox_to_anchor=(1,1))
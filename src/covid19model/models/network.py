@@ -1091,14 +1091,14 @@ class SEIRSNetworkModel():
         # extend with plotting data and using dates (extra argument startDate)
         fig, ax = plt.subplots()
         ax.plot(self.tseries,numpy.mean(self.sumS,axis=1),color=black)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumS,90,axis=1), numpy.percentile(self.sumS,10,axis=1),color=black,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumS,[90,10],axis=1),color=black,alpha=0.2,rasterized=True)
         ax.plot(self.tseries,numpy.mean(self.sumE,axis=1),color=orange)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumE,90,axis=1), numpy.percentile(self.sumE,10,axis=1),color=orange,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumE,[90,10],axis=1),color=orange,alpha=0.2,rasterized=True)
         I = self.sumA + self.sumM + self.sumCtot + self.sumMi + self.sumICU
         ax.plot(self.tseries,numpy.mean(I,axis=1),color=red)
-        ax.fill_between(self.tseries, numpy.percentile(I,90,axis=1), numpy.percentile(I,10,axis=1),color=red,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(I,[90,10],axis=1),color=red,alpha=0.2,rasterized=True)
         ax.plot(self.tseries,numpy.mean(self.sumR,axis=1),color=green)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumR,90,axis=1), numpy.percentile(self.sumR,10,axis=1),color=green,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumR,[90,10],axis=1),color=green,alpha=0.2,rasterized=True)
         ax.legend(('susceptible','exposed','total infected','immune'), loc="upper left", bbox_to_anchor=(1,1))
         ax.set_xlabel('days')
         ax.set_ylabel('number of patients')
@@ -1125,18 +1125,18 @@ class SEIRSNetworkModel():
         fig, ax = plt.subplots()
         if asymptomatic is not False:
             ax.plot(self.tseries,numpy.mean(self.sumA,axis=1),color=blue)
-            ax.fill_between(self.tseries, numpy.percentile(self.sumA,90,axis=1), numpy.percentile(self.sumA,10,axis=1),color=blue,alpha=0.2)
+            ax.fill_between(self.tseries, *numpy.percentile(self.sumA,[90,10],axis=1),color=blue,alpha=0.2,rasterized=True)
         if mild is not False:
             ax.plot(self.tseries,numpy.mean(self.sumM,axis=1),color=green)
-            ax.fill_between(self.tseries, numpy.percentile(self.sumM,90,axis=1), numpy.percentile(self.sumM,10,axis=1),color=green,alpha=0.2)
+            ax.fill_between(self.tseries, *numpy.percentile(self.sumM,[90,10],axis=1),color=green,alpha=0.2,rasterized=True)
         H = self.sumCtot + self.sumMi + self.sumICU
         ax.plot(self.tseries,numpy.mean(H,axis=1),color=orange)
-        ax.fill_between(self.tseries, numpy.percentile(H,90,axis=1), numpy.percentile(H,10,axis=1),color=orange,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(H,[90,10],axis=1),color=orange,alpha=0.2,rasterized=True)
         icu = self.sumMi + self.sumICU
         ax.plot(self.tseries,numpy.mean(icu,axis=1),color=red)
-        ax.fill_between(self.tseries, numpy.percentile(icu,90,axis=1), numpy.percentile(icu,10,axis=1),color=red,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(icu,[90,10],axis=1),color=red,alpha=0.2,rasterized=True)
         ax.plot(self.tseries,numpy.mean(self.sumD,axis=1),color=black)
-        ax.fill_between(self.tseries, numpy.percentile(self.sumD,90,axis=1), numpy.percentile(self.sumD,10,axis=1),color=black,alpha=0.2)
+        ax.fill_between(self.tseries, *numpy.percentile(self.sumD,[90,10],axis=1),color=black,alpha=0.2,rasterized=True)
         if mild is not False and asymptomatic is not False:
             legend_labels = ('asymptomatic','mild','hospitalised','ICU','dead')
         elif mild is not False and asymptomatic is False:
@@ -1201,7 +1201,7 @@ class SEIRSNetworkModel():
         for i in range(n):
             som = 0
             for j in positions[i]:
-                som = som + numpy.mean(out[j],axis=1).reshape(numpy.mean(out[j],axis=1).size,1)
+                som = som + numpy.mean(out[j],axis=1)[:,None]
             ymodel.append(som[extraTime:,0].reshape(som[extraTime:,0].size,1))
             # calculate quadratic error
             SSE = SSE + weights[i]*sum((ymodel[i]-data[i])**2)
@@ -1294,8 +1294,7 @@ class SEIRSNetworkModel():
             for j in positions[i]:
                 ymodel = ymodel + out[j]
             ax.plot(index_acc,numpy.mean(ymodel,axis=1),'--',color=modelClr[i])
-            ax.fill_between(index_acc,numpy.percentile(ymodel,95,axis=1),
-                 numpy.percentile(ymodel,5,axis=1),color=modelClr[i],alpha=0.2)
+            ax.fill_between(index_acc,*numpy.percentile(ymodel,[95,5],axis=1),color=modelClr[i],alpha=0.2,rasterized=True)
         # Attributes
         if legendText is not None:
             ax.legend(legendText, loc="upper left", bbox_to_anchor=(1,1))
@@ -1405,8 +1404,7 @@ class SEIRSNetworkModel():
             for j in positions[i]:
                 ymodel = ymodel + out[j]
             ax.plot(t_acc,numpy.mean(ymodel,axis=1),'--',color=modelClr[i])
-            ax.fill_between(t_acc,numpy.percentile(ymodel,95,axis=1),
-                 numpy.percentile(ymodel,5,axis=1),color=modelClr[i],alpha=0.2)
+            ax.fill_between(t_acc,*numpy.percentile(ymodel,[95,5],axis=1),color=modelClr[i],alpha=0.2,rasterized=True)
         # Attributes
         if legendText is not None:
             ax.legend(legendText, loc="upper left", bbox_to_anchor=(1,1))
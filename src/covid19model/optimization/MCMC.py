@@ -3,7 +3,7 @@ import multiprocessing as mp
 from covid19model.optimization import objective_fcns
 from covid19model.optimization import pso
 
-def fit_pso(model,data,parNames,states,bounds,checkpoints=None,samples=None,disp=True,maxiter=30,popsize=10):
+def fit_pso(model,data,parNames,states,bounds,checkpoints=None,samples=None,disp=True,maxiter=30,popsize=10,return_swarm=False):
     """
     A function to compute the mimimum of the absolute value of the maximum likelihood estimator using a particle swarm optimization
 
@@ -30,11 +30,15 @@ def fit_pso(model,data,parNames,states,bounds,checkpoints=None,samples=None,disp
     popsize: float or int
         population size of particle swarm
         increasing this variable lowers the chance of finding local minima but slows down calculations
+    return_swarm: boolean
+        if True, also return the best positions of the particles in the final swarm
 
     Returns
     -----------
     theta_hat : array
         maximum likelihood estimates of model parameters
+    swarm : array
+        best position of every particle (popsize x number of parameters), only returned if return_swarm is True
 
     Notes
     -----------
@@ -52,5 +56,59 @@ def fit_pso(model,data,parNames,states,bounds,checkpoints=None,samples=None,disp
                                                                                 processes=mp.cpu_count()-1,minfunc=1e-9, minstep=1e-9,debug=True, particle_output=True)
     theta_hat = p_hat
 
+    if return_swarm:
+        return theta_hat, pars_final_swarm
     return theta_hat
 
+def perturbate_PSO(theta,swarm,nwalkers,bounds,scale=1e-2,max_redraws=100):
+    """
+    A function to draw the initial positions of the MCMC walkers around the PSO estimate
+
+    Parameters
+    -----------
+    theta: array
+        PSO estimate of the model parameters
+    swarm: array
+        best positions of the particles in the final swarm, as returned by fit_pso(...,return_swarm=True)
+    nwalkers: int
+        number of walkers
+    bounds: tuple
+        contains one tuples with the (finite) lower and upper bounds of each parameter theta
+    scale: float
+        scaling of the swarm covariance
+    max_redraws: int
+        maximum number of times the walkers outside the bounds are redrawn
+
+    Returns
+    -----------
+    pos : array
+        initial positions of the walkers (nwalkers x number of parameters), all inside the bounds
+
+    Notes
+    -----------
+    The walkers are drawn from a normal distribution with the (scaled) covariance of the final swarm,
+    so the initial ball is stretched along the correlations the swarm found instead of being an arbitrary
+    independent perturbation. Parameters in which the swarm collapsed get a standard deviation of scale times
+    the width of their bounds instead. Walkers still outside the bounds after max_redraws redraws are clipped
+    to just inside the bounds.
+
+    Example use
+    -----------
+    theta, swarm = fit_pso(model,data,parNames,states,bounds,return_swarm=True)
+    pos = perturbate_PSO(theta,swarm,nwalkers,bounds)
+    """
+
+    lb, ub = np.array(bounds, dtype=float).T
+    cov = scale*np.atleast_2d(np.cov(swarm, rowvar=False))
+    collapsed = np.diag(cov) == 0
+    cov[collapsed,collapsed] = (scale*(ub-lb)[collapsed])**2
+    pos = np.random.multivariate_normal(theta, cov, size=nwalkers)
+    # redraw the walkers outside the (open) bounds of the uniform prior
+    outside = ~np.all((pos > lb) & (pos < ub), axis=1)
+    for i in range(max_redraws):
+        if not np.any(outside):
+            break
+        pos[outside] = np.random.multivariate_normal(theta, cov, size=np.sum(outside))
+        outside = ~np.all((pos > lb) & (pos < ub), axis=1)
+    return np.clip(pos, np.nextafter(lb, ub), np.nextafter(ub, lb))
+
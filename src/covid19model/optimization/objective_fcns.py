@@ -1,6 +1,23 @@
+from functools import lru_cache
+
 import numpy as np
 from covid19model.data import polymod
 
+@lru_cache(maxsize=None)
+def _prevention_matrices():
+    """
+    Returns the interaction matrices of the seven lockdown-release stages, before multiplication with 'prevention'.
+    These only depend on the polymod data, so they are computed once instead of on every call to the objective function.
+    """
+    initN, Nc_home, Nc_work, Nc_schools, Nc_transport, Nc_leisure, Nc_others, Nc_total = polymod.get_interaction_matrices()
+    return np.array([1.0*Nc_home + (1-0.60)*Nc_work + (1-0.70)*Nc_transport + (1-0.30)*Nc_others + (1-0.80)*Nc_leisure,
+                     1.0*Nc_home + (1-0.50)*Nc_work + (1-0.60)*Nc_transport + (1-0.30)*Nc_others + (1-0.70)*Nc_leisure,
+                     1.0*Nc_home + (1-0.40)*Nc_work + (1-0.55)*Nc_transport + (1-0.25)*Nc_others + (1-0.65)*Nc_leisure,
+                     1.0*Nc_home + (1-0.30)*Nc_work + (1-0.50)*Nc_transport + (1-0.20)*Nc_others + (1-0.60)*Nc_leisure,
+                     1.0*Nc_home + (1-0.30)*Nc_work + (1-0.45)*Nc_transport + (1-0.85)*Nc_schools + (1-0.15)*Nc_others + (1-0.50)*Nc_leisure,
+                     1.0*Nc_home + (1-0.25)*Nc_work + (1-0.35)*Nc_transport + (1-0.35)*Nc_schools + (1-0.10)*Nc_others + (1-0.30)*Nc_leisure,
+                     1.0*Nc_home + (1-0.20)*Nc_work + (1-0.15)*Nc_transport + (1-0.00)*Nc_others + (1-0.00)*Nc_leisure])
+
 def SSE(thetas,BaseModel,data,states,parNames,weights,checkpoints=None):
 
     """
@@ -48,6 +65,8 @@ def SSE(thetas,BaseModel,data,states,parNames,weights,checkpoints=None):
     # ~~~~~~~~~~~~~~
     # number of dataseries
     n = len(data) 
+    # work on the underlying arrays, not on pandas objects (no copy for a Series)
+    data = [np.asarray(series) for series in data]
     # Compute simulation time
     data_length =[]
     for i in range(n):
@@ -59,16 +78,17 @@ def SSE(thetas,BaseModel,data,states,parNames,weights,checkpoints=None):
     # -------------
     # calculate SSE
     # -------------
+    axis = out[states[0][0]].dims.index("stratification")
     ymodel=[]
     SSE = 0
     for i in range(n):
         som = 0
-        # sum required states
+        # sum required states (reduce the underlying arrays directly, not through xarray)
         for j in range(len(states[i])):
-            som = som + out[states[i][j]].sum(dim="stratification").values
+            som = som + out[states[i][j]].values.sum(axis=axis)
         ymodel.append(som[BaseModel.extraTime:])
         # calculate quadratic error
-        SSE = SSE + weights[i]*sum((ymodel[i]-data[i])**2)
+        SSE = SSE + weights[i]*np.sum((ymodel[i]-data[i])**2)
     return SSE
 
 def MLE(thetas,BaseModel,data,states,parNames,checkpoints=None,samples=None):
@@ -108,7 +128,7 @@ def MLE(thetas,BaseModel,data,states,parNames,checkpoints=None,samples=None):
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
     # assign estimates to correct variable
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-    initN, Nc_home, Nc_work, Nc_schools, Nc_transport, Nc_leisure, Nc_others, Nc_total = polymod.get_interaction_matrices()
+    Nc_prev = _prevention_matrices()
     # by defenition, if N is the number of data timeseries then the first N parameters are the estimated variances of these timeseries!
     i = 0
     sigma=[]
@@ -116,7 +136,7 @@ def MLE(thetas,BaseModel,data,states,parNames,checkpoints=None,samples=None):
         if param == 'extraTime': # don't know if there's a way to make this function more general due to the 'extraTime', can this be abstracted in any way?
             setattr(BaseModel,param,int(round(thetas[i])))
         elif param == 'prevention':
-            checkpoints.update({'Nc':  [thetas[i]*(1.0*Nc_home + (1-0.60)*Nc_work + (1-0.70)*Nc_transport + (1-0.30)*Nc_others + (1-0.80)*Nc_leisure)]})
+            checkpoints.update({'Nc':  [thetas[i]*Nc_prev[0]]})
         # The following section is needed to perform a recalibration of beta
         #elif param == 'beta':
         #    estimate_beta = thetas[i]
@@ -144,41 +164,37 @@ def MLE(thetas,BaseModel,data,states,parNames,checkpoints=None,samples=None):
     # ~~~~~~~~~~~~~~
     # number of dataseries
     n = len(data) 
+    # work on the underlying arrays, not on pandas objects (no copy for a Series)
+    data = [np.asarray(series) for series in data]
     # Compute simulation time
     data_length =[]
     for i in range(n):
         data_length.append(data[i].size)
     T = max(data_length)+BaseModel.extraTime-1
     # Use previous samples
+    # (draw an index, np.random.choice converts the complete list of samples to an array on every call)
     if samples:
         for param in samples:
             if param == 'prevention':
-                prevention = np.random.choice(samples[param])
-                checkpoints.update(
-                    {'Nc': [prevention*(1.0*Nc_home + (1-0.60)*Nc_work + (1-0.70)*Nc_transport + (1-0.30)*Nc_others + (1-0.80)*Nc_leisure),
-                            prevention*(1.0*Nc_home + (1-0.50)*Nc_work + (1-0.60)*Nc_transport + (1-0.30)*Nc_others + (1-0.70)*Nc_leisure),
-                            prevention*(1.0*Nc_home + (1-0.40)*Nc_work + (1-0.55)*Nc_transport + (1-0.25)*Nc_others + (1-0.65)*Nc_leisure),
-                            prevention*(1.0*Nc_home + (1-0.30)*Nc_work + (1-0.50)*Nc_transport + (1-0.20)*Nc_others + (1-0.60)*Nc_leisure),
-                            prevention*(1.0*Nc_home + (1-0.30)*Nc_work + (1-0.45)*Nc_transport + (1-0.85)*Nc_schools + (1-0.15)*Nc_others + (1-0.50)*Nc_leisure),
-                            prevention*(1.0*Nc_home + (1-0.25)*Nc_work + (1-0.35)*Nc_transport + (1-0.35)*Nc_schools + (1-0.10)*Nc_others + (1-0.30)*Nc_leisure),
-                            prevention*(1.0*Nc_home + (1-0.20)*Nc_work + (1-0.15)*Nc_transport + (1-0.00)*Nc_others + (1-0.00)*Nc_leisure)]
-                    })
+                prevention = samples[param][np.random.randint(len(samples[param]))]
+                checkpoints.update({'Nc': list(prevention*Nc_prev)})
                 #checkpoints.update({'Nc':  [prevention*(1.3*Nc_home + (1-0.60)*Nc_work + (1-0.70)*Nc_transport + (1-0.30)*Nc_others + (1-0.80)*Nc_leisure)]})
             else:
-                BaseModel.parameters[param] = np.random.choice(samples[param],1,replace=False)
+                BaseModel.parameters[param] = np.array([samples[param][np.random.randint(len(samples[param]))]])
     # Perform simulation
     out=BaseModel.sim(T,checkpoints=checkpoints)
 
     # -------------
     # calculate MLE
     # -------------
+    axis = out[states[0][0]].dims.index("stratification")
     ymodel=[]
     MLE = 0
     for i in range(n):
         som = 0
-        # sum required states
+        # sum required states (reduce the underlying arrays directly, not through xarray)
         for j in range(len(states[i])):
-            som = som + out[states[i][j]].sum(dim="stratification").values
+            som = som + out[states[i][j]].values.sum(axis=axis)
         ymodel.append(som[BaseModel.extraTime:])
         # calculate simga2 and log-likelihood function
         MLE = MLE - 0.5 * np.sum((data[i] - ymodel[i]) ** 2 / sigma[i]**2 + np.log(sigma[i]**2))
@@ -212,18 +228,11 @@ def log_prior(thetas,bounds):
     lp = log_prior(thetas,bounds)
     """
 
-    lp=[]
+    # the prior is flat, so only the bounds matter: stop at the first parameter outside its bounds
     for i in range(len(bounds)):
-        prob = 1/(bounds[i][1]-bounds[i][0])
-        condition = bounds[i][0] < thetas[i] < bounds[i][1]
-        if condition == True:
-            lp.append(np.log(prob))
-        else:
-            lp.append(-np.inf)
-    if not np.isfinite(lp).all():
-        return - np.inf
-    else:
-        return 0
+        if not bounds[i][0] < thetas[i] < bounds[i][1]:
+            return - np.inf
+    return 0
 
 def log_probability(thetas,BaseModel,bounds,data,states,parNames,checkpoints=None,samples=None):
 
@@ -22,6 +22,22 @@ def _cons_f_ieqcons_wrapper(f_ieqcons, args, kwargs, x):
     return np.array(f_ieqcons(x, *args, **kwargs))
 
 
+# objective and feasibility functions of a worker process, set once by the
+# pool initializer so the (large) function arguments are not pickled with every task
+_worker_obj = None
+_worker_is_feasible = None
+
+
+def _init_worker(obj, is_feasible):
+    global _worker_obj, _worker_is_feasible
+    _worker_obj = obj
+    _worker_is_feasible = is_feasible
+
+
+def _worker_evaluate(x):
+    return _worker_obj(x), _worker_is_feasible(x)
+
+
 def optim(func, bounds, ieqcons=[], f_ieqcons=None, args=(), kwargs={},
         swarmsize=100, omega=0.8, phip=0.8, phig=0.8, maxiter=100,
         minstep=1e-12, minfunc=1e-12, debug=False, processes=1,
@@ -129,78 +145,36 @@ def optim(func, bounds, ieqcons=[], f_ieqcons=None, args=(), kwargs={},
     is_feasible = partial(_is_feasible_wrapper, cons)
 
     # Initialize the multiprocessing module if necessary
+    # (the pool is closed in the finally clause, whichever way the search ends)
+    mp_pool = None
     if processes > 1:
         import multiprocessing
-        mp_pool = multiprocessing.Pool(processes)
-    # Initialize the particle swarm ############################################
-    S = swarmsize
-    D = len(lb)  # the number of dimensions each particle has
-    x = np.random.rand(S, D)  # particle positions
-    v = np.zeros_like(x)  # particle velocities
-    p = np.zeros_like(x)  # best particle positions
-    fx = np.zeros(S)  # current particle function values
-    fs = np.zeros(S, dtype=bool)  # feasibility of each particle
-    fp = np.ones(S)*np.inf  # best particle function values
-    g = []  # best swarm position
-
-    fg = np.inf  # best swarm position starting value
-
-    # Initialize the particle's position
-    x = lb + x*(ub - lb)
-    # if needed, transform the parameter vector
-    if transform_pars is not None:
-        x = np.apply_along_axis(transform_pars, 1, x)
-
-
-    # Calculate objective and constraints for each particle
-    if processes > 1:
-        fx = np.array(mp_pool.map(obj, x))
-        fs = np.array(mp_pool.map(is_feasible, x))
-    else:
-        for i in range(S):
-            fx[i] = obj(x[i, :])
-            fs[i] = is_feasible(x[i, :])
-
-    # Store particle's best position (if constraints are satisfied)
-    i_update = np.logical_and((fx < fp), fs)
-    p[i_update, :] = x[i_update, :].copy()
-    fp[i_update] = fx[i_update]
-
-    # Update swarm's best position
-    i_min = np.argmin(fp)
-    if fp[i_min] < fg:
-        fg = fp[i_min]
-        g = p[i_min, :].copy()
-    else:
-        # At the start, there may not be any feasible starting point, so just
-        # give it a temporary "best" point since it's likely to change
-        g = x[0, :].copy()
-       
-    # Initialize the particle's velocity
-    v = vlow + np.random.rand(S, D)*(vhigh - vlow)
-
-    # Iterate until termination criterion met ##################################
-    it = 1
-    while it <= maxiter:
-        rp = np.random.uniform(size=(S, D))
-        rg = np.random.uniform(size=(S, D))
-        # Update the particles velocities
-        v = omega*v + phip*rp*(p - x) + phig*rg*(g - x)
-        # Update the particles' positions
-        x = x + v
-        # Correct for bound violations
-        maskl = x < lb
-        masku = x > ub
-        x = x*(~np.logical_or(maskl, masku)) + lb*maskl + ub*masku
+        mp_pool = multiprocessing.Pool(processes, initializer=_init_worker,
+                                       initargs=(obj, is_feasible))
+    try:
+        # Initialize the particle swarm ############################################
+        S = swarmsize
+        D = len(lb)  # the number of dimensions each particle has
+        x = np.random.rand(S, D)  # particle positions
+        v = np.zeros_like(x)  # particle velocities
+        p = np.zeros_like(x)  # best particle positions
+        fx = np.zeros(S)  # current particle function values
+        fs = np.zeros(S, dtype=bool)  # feasibility of each particle
+        fp = np.ones(S)*np.inf  # best particle function values
+        g = []  # best swarm position
+
+        fg = np.inf  # best swarm position starting value
+
+        # Initialize the particle's position
+        x = lb + x*(ub - lb)
         # if needed, transform the parameter vector
         if transform_pars is not None:
             x = np.apply_along_axis(transform_pars, 1, x)
 
 
-        # Update objectives and constraints
+        # Calculate objective and constraints for each particle
         if processes > 1:
-            fx = np.array(mp_pool.map(obj, x))
-            fs = np.array(mp_pool.map(is_feasible, x))
+            fx, fs = map(np.array, zip(*mp_pool.map(_worker_evaluate, x)))
         else:
             for i in range(S):
                 fx[i] = obj(x[i, :])
@@ -211,43 +185,91 @@ def optim(func, bounds, ieqcons=[], f_ieqcons=None, args=(), kwargs={},
         p[i_update, :] = x[i_update, :].copy()
         fp[i_update] = fx[i_update]
 
-        # Compare swarm's best position with global best position
+        # Update swarm's best position
         i_min = np.argmin(fp)
         if fp[i_min] < fg:
-            if debug:
-                print('New best for swarm at iteration {:}: {:} {:}'\
-                    .format(it, p[i_min, :], fp[i_min]))
-
-            p_min = p[i_min, :].copy()
-            stepsize = np.sqrt(np.sum((g - p_min)**2))
-
-            if np.abs(fg - fp[i_min]) <= minfunc:
-                print('Stopping search: Swarm best objective change less than {:}'\
-                    .format(minfunc))
-                if particle_output:
-                    return p_min, fp[i_min], p, fp
-                else:
-                    return p_min, fp[i_min]
-            elif stepsize <= minstep:
-                print('Stopping search: Swarm best position change less than {:}'\
-                    .format(minstep))
-                if particle_output:
-                    return p_min, fp[i_min], p, fp
-                else:
-                    return p_min, fp[i_min]
+            fg = fp[i_min]
+            g = p[i_min, :].copy()
+        else:
+            # At the start, there may not be any feasible starting point, so just
+            # give it a temporary "best" point since it's likely to change
+            g = x[0, :].copy()
+       
+        # Initialize the particle's velocity
+        v = vlow + np.random.rand(S, D)*(vhigh - vlow)
+
+        # Iterate until termination criterion met ##################################
+        it = 1
+        while it <= maxiter:
+            rp = np.random.uniform(size=(S, D))
+            rg = np.random.uniform(size=(S, D))
+            # Update the particles velocities
+            v = omega*v + phip*rp*(p - x) + phig*rg*(g - x)
+            # Update the particles' positions
+            x = x + v
+            # Correct for bound violations
+            maskl = x < lb
+            masku = x > ub
+            x = x*(~np.logical_or(maskl, masku)) + lb*maskl + ub*masku
+            # if needed, transform the parameter vector
+            if transform_pars is not None:
+                x = np.apply_along_axis(transform_pars, 1, x)
+
+
+            # Update objectives and constraints
+            if processes > 1:
+                fx, fs = map(np.array, zip(*mp_pool.map(_worker_evaluate, x)))
             else:
-                g = p_min.copy()
-                fg = fp[i_min]
+                for i in range(S):
+                    fx[i] = obj(x[i, :])
+                    fs[i] = is_feasible(x[i, :])
+
+            # Store particle's best position (if constraints are satisfied)
+            i_update = np.logical_and((fx < fp), fs)
+            p[i_update, :] = x[i_update, :].copy()
+            fp[i_update] = fx[i_update]
+
+            # Compare swarm's best position with global best position
+            i_min = np.argmin(fp)
+            if fp[i_min] < fg:
+                if debug:
+                    print('New best for swarm at iteration {:}: {:} {:}'\
+                        .format(it, p[i_min, :], fp[i_min]))
+
+                p_min = p[i_min, :].copy()
+                stepsize = np.sqrt(np.sum((g - p_min)**2))
+
+                if np.abs(fg - fp[i_min]) <= minfunc:
+                    print('Stopping search: Swarm best objective change less than {:}'\
+                        .format(minfunc))
+                    if particle_output:
+                        return p_min, fp[i_min], p, fp
+                    else:
+                        return p_min, fp[i_min]
+                elif stepsize <= minstep:
+                    print('Stopping search: Swarm best position change less than {:}'\
+                        .format(minstep))
+                    if particle_output:
+                        return p_min, fp[i_min], p, fp
+                    else:
+                        return p_min, fp[i_min]
+                else:
+                    g = p_min.copy()
+                    fg = fp[i_min]
 
-        if debug:
-            print('Best after iteration {:}: {:} {:}'.format(it, g, fg))
-        it += 1
+            if debug:
+                print('Best after iteration {:}: {:} {:}'.format(it, g, fg))
+            it += 1
 
-    print('Stopping search: maximum iterations reached --> {:}'.format(maxiter))
+        print('Stopping search: maximum iterations reached --> {:}'.format(maxiter))
 
-    if not is_feasible(g):
-        print("However, the optimization couldn't find a feasible design. Sorry")
-    if particle_output:
-        return g, fg, p, fp
-    else:
-        return g, fg
+        if not is_feasible(g):
+            print("However, the optimization couldn't find a feasible design. Sorry")
+        if particle_output:
+            return g, fg, p, fp
+        else:
+            return g, fg
+    finally:
+        if mp_pool is not None:
+            mp_pool.close()
+            mp_pool.join()
@@ -3,6 +3,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
+# Start of the Belgian lockdown, marked on every mobility panel
+LOCKDOWN_START = pd.Timestamp('2020-03-13')
+
 def google_mobility(data):
     """Create plot of google mobility data
 
@@ -25,7 +28,7 @@ def google_mobility(data):
     for i in range(3):
         for j in range(2):
             ax[i,j].plot(data.index, data[data_lst[i][j]])
-            ax[i,j].axvline(x=pd.Timestamp('2020-03-13'), color='k', linestyle='--')
+            ax[i,j].axvline(x=LOCKDOWN_START, color='k', linestyle='--')
             ax[i,j].set_ylabel('% compared to baseline')
             # Hide the right and top spines
             ax[i,j].spines['right'].set_visible(False)
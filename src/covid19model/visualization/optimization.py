@@ -8,7 +8,7 @@ import numpy as np
 from .utils import colorscale_okabe_ito
 from .output import _apply_tick_locator
 
-def traceplot(samples,labels,plt_kwargs={},filename=None):
+def traceplot(samples,labels,plt_kwargs={},filename=None,thin=1,axes=None):
     """Make a visualization of sampled parameters
 
     Parameters
@@ -20,6 +20,12 @@ def traceplot(samples,labels,plt_kwargs={},filename=None):
         A list containing the names of the sampled parameters. Must be the same length as the z-dimension of the samples np.array.
     plt_kwargs: dictionary
         A dictionary containing arguments for the plt.plot function.
+    thin: int
+        Only plot every thin-th sample. Use a thinning factor proportional to the chain length
+        (e.g. max(1, nsamples//1000)) to keep the cost of redrawing long chains constant.
+    axes: list of matplotlib.axes.Axes, optional
+        Axes of a previous call to traceplot. These are cleared and redrawn instead of creating a new figure,
+        which avoids building (and closing) a figure on every update of a running chain.
 
     Returns
     -------
@@ -33,20 +39,26 @@ def traceplot(samples,labels,plt_kwargs={},filename=None):
         "The length of label list is not equal to the length of the z-dimension of the samples.\n"
         "The list of label is of length: {0}. The z-dimension of the samples of length: {1}".format(len(labels), ndim)
         )
-    # initialise figure
-    fig, axes = plt.subplots(len(labels))
-    # set size
-    fig.set_size_inches(10, len(labels)*7/3)
+    # initialise figure or reuse the provided axes
+    if axes is None:
+        fig, axes = plt.subplots(len(labels))
+        # set size
+        fig.set_size_inches(10, len(labels)*7/3)
+    else:
+        fig = axes[0].get_figure()
+        for ax in axes:
+            ax.clear()
     # plot data
+    steps = np.arange(0, nsamples, thin)
     for i in range(ndim):
         ax = axes[i]
-        ax.plot(samples[:, :, i], **plt_kwargs)
+        ax.plot(steps, samples[::thin, :, i], **plt_kwargs)
         ax.set_xlim(0, nsamples)
         ax.set_ylabel(labels[i])
     axes[-1].set_xlabel("step number")
 
     if filename:
-        plt.savefig(filename, dpi=600, bbox_inches='tight',
+        fig.savefig(filename, dpi=600, bbox_inches='tight',
                     orientation='portrait', papertype='a4')
 
     return ax
@@ -112,14 +124,18 @@ def plot_fit(y_model,data,start_date,lag_time,states,end_date=None,with_ints=Tru
     if with_ints==True:
         idx = pd.date_range(start_date,freq='D',periods=data[0].size + lag_time + T) - datetime.timedelta(days=lag_time)
     else:
-        idx_model = pd.date_range(pd.to_datetime(start_date)-pd.to_timedelta(lag_time, unit='days'),
-                                  pd.to_datetime(end_date))
+        # convert the dates once
+        start_date = pd.to_datetime(start_date)
+        end_date = pd.to_datetime(end_date)
+        idx_model = pd.date_range(start_date-pd.to_timedelta(lag_time, unit='days'),
+                                  end_date)
 
-        idx_data = pd.date_range(pd.to_datetime(start_date),
-                                  pd.to_datetime(end_date))
+        idx_data = pd.date_range(start_date,
+                                  end_date)
 
     # Plot model prediction
-    y_model = y_model.sum(dim="stratification")
+    # (only reduce the states that are plotted, not every state of the model output)
+    y_model = y_model[list(dict.fromkeys(state for state_lst in states for state in state_lst))].sum(dim="stratification")
     for i in range(len(data)):
         # dummy lines for legend
         lines = ax.plot([],[],plt_clr[i],alpha=1)
@@ -136,8 +152,7 @@ def plot_fit(y_model,data,start_date,lag_time,states,end_date=None,with_ints=Tru
             lines=ax.scatter(idx[lag_time:-T],data[i],color="black",facecolors='none',**sct_kwargs)
         else:
             if len(data[i]) < len(idx_data):
-                idx_data_short = pd.date_range(pd.to_datetime(start_date),
-                                               pd.to_datetime(start_date)+pd.to_timedelta(len(data[i])-1, unit='days'))
+                idx_data_short = idx_data[:len(data[i])]
                 lines=ax.scatter(idx_data_short,data[i],color="black",facecolors='none',**sct_kwargs)
             else:
                 lines=ax.scatter(idx_data,data[i],color="black",facecolors='none',**sct_kwargs)
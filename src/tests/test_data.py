@@ -5,6 +5,7 @@ import pandas as pd
 
 from covid19model.data.sciensano import get_sciensano_COVID19_data
 from covid19model.data.google import get_google_mobility_data
+from covid19model.data.polymod import get_interaction_matrices
 
 def test_sciensano_output():
     # check the characteristics of the sciensano data loda function
@@ -24,4 +25,14 @@ def test_google_output():
                                    'residential'])
     # index is a datetime index with daily frequency
     assert isinstance(df.index, pd.DatetimeIndex)
-    assert df.index.freq == 'D'
\ No newline at end of file
+    assert df.index.freq == 'D'
+
+def test_interaction_matrices_output():
+    # check the characteristics of the polymod interaction matrices
+    initN, *Nc_all = get_interaction_matrices()
+    assert initN.shape == (9,)
+    for Nc in Nc_all:
+        assert Nc.shape == (9, 9)
+    # the cached matrices are not altered by in-place changes of the user
+    Nc_all[0][:] = 0
+    assert get_interaction_matrices()[1].sum() > 0
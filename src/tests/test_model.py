@@ -44,6 +44,48 @@ def test_model_simple_sir():
     assert I[-1] // 10 == 188
 
 
+class SIRjacobian(SIR):
+
+    @staticmethod
+    def jacobian(t, S, I, R, beta, gamma):
+        """Jacobian of the basic SIR model"""
+        S, I, R = S[0], I[0], R[0]
+        N = S + I + R
+        dinf_dS = beta*I*(I+R)/N**2
+        dinf_dI = beta*S*(S+R)/N**2
+        dinf_dR = -beta*I*S/N**2
+
+        return np.array([[-dinf_dS, -dinf_dI, -dinf_dR],
+                         [dinf_dS, dinf_dI - gamma, dinf_dR],
+                         [0, gamma, 0]])
+
+
+def test_model_simple_sir_jacobian():
+    parameters = {"beta": 0.9, "gamma": 0.2}
+    initial_states = {"S": [1_000_000 - 10], "I": [10], "R": [0]}
+
+    model = SIRjacobian(initial_states, parameters)
+
+    time = [0, 50]
+    output = model.sim(time, checkpoints={"time": []}, method='BDF')
+    output_rk = model.sim(time, checkpoints={"time": []})
+
+    np.testing.assert_allclose(output["time"], np.arange(0, 51))
+    np.testing.assert_allclose(output["R"], output_rk["R"], rtol=0.05, atol=10)
+
+
+def test_model_simple_sir_odeint():
+    parameters = {"beta": 0.9, "gamma": 0.2}
+    initial_states = {"S": [1_000_000 - 10], "I": [10], "R": [0]}
+
+    time = [0, 50]
+    output_rk = SIR(initial_states, parameters).sim(time, checkpoints={"time": []})
+    for model in [SIR(initial_states, parameters), SIRjacobian(initial_states, parameters)]:
+        output = model.sim(time, checkpoints={"time": []}, method='odeint')
+        np.testing.assert_allclose(output["time"], np.arange(0, 51))
+        np.testing.assert_allclose(output["R"], output_rk["R"], rtol=0.05, atol=10)
+
+
 def test_model_init_validation():
     # valid initialization
     parameters = {"beta": 0.9, "gamma": 0.2}
@@ -222,3 +264,34 @@ def test_model_interaction_matrix_function():
     # without the reduction in contact, the recovered/dead pool will always be larger
     output_without = model.sim(time)
     assert (output['R'] <= output_without['R']).all()
+
+
+def test_covid19_seird_jacobian():
+    from covid19model.models.models import COVID19_SEIRD
+    from covid19model.data.parameters import get_COVID19_SEIRD_parameters
+
+    parameters = get_COVID19_SEIRD_parameters()
+    # enough tests to have a test rate below one (and a non-zero derivative)
+    parameters["totalTests"] = 1e5
+    rng = np.random.RandomState(0)
+    initial_states = {state: rng.uniform(1, 1e5, 9) for state in COVID19_SEIRD.state_names}
+    # the same states with an empty first age bin
+    empty_bin = {state: np.concatenate([[0], values[1:]]) for state, values in initial_states.items()}
+
+    for states in [initial_states, empty_bin]:
+        model = COVID19_SEIRD(states, parameters)
+        model.time_of_lst_chk = 0
+
+        fun = model._create_fun()
+        jac = model._create_jac()
+        y = np.concatenate(list(states.values()))
+
+        # compare with central finite differences
+        J = jac(0, y)
+        assert np.all(np.isfinite(J))
+        J_fd = np.empty_like(J)
+        for k in range(y.size):
+            dy = np.zeros(y.size)
+            dy[k] = 1e-3*max(y[k], 1)
+            J_fd[:, k] = (fun(0, y + dy) - fun(0, y - dy))/(2*dy[k])
+        np.testing.assert_allclose(J, J_fd, rtol=1e-5, atol=1e-9)
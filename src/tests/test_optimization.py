@@ -0,0 +1,28 @@
+
+import numpy as np
+
+from covid19model.optimization.MCMC import perturbate_PSO
+
+
+def test_perturbate_pso_within_bounds():
+    bounds = ((0, 1), (0, 1))
+    rng = np.random.RandomState(0)
+    swarm = np.column_stack([rng.uniform(0.4, 0.6, 10), rng.uniform(0.1, 0.2, 10)])
+    pos = perturbate_PSO(np.array([0.5, 0.15]), swarm, 20, bounds)
+    assert pos.shape == (20, 2)
+    assert np.all((pos > 0) & (pos < 1))
+
+
+def test_perturbate_pso_collapsed_on_bound():
+    # swarm collapsed on a parameter estimate of zero, which is also its lower bound
+    theta = np.array([0., .5])
+    swarm = np.tile(theta, (10, 1))
+    pos = perturbate_PSO(theta, swarm, 4, ((0, 1), (0, 1)))
+    assert pos.shape == (4, 2)
+    assert np.all((pos > 0) & (pos < 1))
+    # the walkers are spread out in the collapsed parameters
+    assert np.all(np.std(pos, axis=0) > 0)
+
+    # walkers that keep landing outside the bounds are clipped instead of redrawn forever
+    pos = perturbate_PSO(theta, swarm, 4, ((0, 1), (0, 1)), max_redraws=0)
+    assert np.all((pos > 0) & (pos < 1))